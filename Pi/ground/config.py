@@ -4,13 +4,17 @@ All configurable parameters for the ground station
 """
 
 import os
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, replace
 from typing import Tuple, Optional
 
 
-@dataclass
+@dataclass(frozen=True)
 class GroundConfig:
-    """Ground station configuration"""
+    """
+    Ground station configuration
+    
+    Immutable once built; use with_overrides() to derive a changed copy.
+    """
     
     # === Identification ===
     callsign: str = "RPGND1"
@@ -68,6 +72,10 @@ class GroundConfig:
     map_offline_path: str = "/RaptorHAB/ground/maps"  # Directory containing .mbtiles files
     map_offline_file: str = "world.mbtiles"  # Default offline map file
     map_prefer_offline: bool = True  # If True, use offline first, online as fallback
+    map_tile_cache_size: int = 512  # Decoded tiles kept in memory per map file (0 = off)
+    # Open map files as immutable (no SQLite locking). Only safe while
+    # nothing downloads into the maps directory.
+    map_offline_immutable: bool = False
     
     # === Ground Station GPS ===
     # L76K GPS on Pi hardware UART (GPIO 14=TX, GPIO 15=RX)
@@ -108,39 +116,48 @@ class GroundConfig:
         - RAPTORHAB_GND_DEBUG
         etc.
         """
-        config = cls()
+        overrides = {}
         
         if os.getenv('RAPTORHAB_GND_CALLSIGN'):
-            config.callsign = os.getenv('RAPTORHAB_GND_CALLSIGN')
+            overrides['callsign'] = os.getenv('RAPTORHAB_GND_CALLSIGN')
         
         if os.getenv('RAPTORHAB_GND_FREQUENCY'):
-            config.frequency_mhz = float(os.getenv('RAPTORHAB_GND_FREQUENCY'))
+            overrides['frequency_mhz'] = float(os.getenv('RAPTORHAB_GND_FREQUENCY'))
         
         if os.getenv('RAPTORHAB_GND_DATA_PATH'):
-            config.data_path = os.getenv('RAPTORHAB_GND_DATA_PATH')
+            overrides['data_path'] = os.getenv('RAPTORHAB_GND_DATA_PATH')
         
         if os.getenv('RAPTORHAB_GND_IMAGE_PATH'):
-            config.image_path = os.getenv('RAPTORHAB_GND_IMAGE_PATH')
+            overrides['image_path'] = os.getenv('RAPTORHAB_GND_IMAGE_PATH')
         
         if os.getenv('RAPTORHAB_GND_LOG_PATH'):
-            config.log_path = os.getenv('RAPTORHAB_GND_LOG_PATH')
+            overrides['log_path'] = os.getenv('RAPTORHAB_GND_LOG_PATH')
         
         if os.getenv('RAPTORHAB_GND_WEB_PORT'):
-            config.web_port = int(os.getenv('RAPTORHAB_GND_WEB_PORT'))
+            overrides['web_port'] = int(os.getenv('RAPTORHAB_GND_WEB_PORT'))
         
         if os.getenv('RAPTORHAB_GND_DEBUG'):
-            config.debug_mode = os.getenv('RAPTORHAB_GND_DEBUG').lower() in ('1', 'true', 'yes')
+            overrides['debug_mode'] = os.getenv('RAPTORHAB_GND_DEBUG').lower() in ('1', 'true', 'yes')
         
         if os.getenv('RAPTORHAB_GND_SIMULATE'):
-            config.simulate_radio = os.getenv('RAPTORHAB_GND_SIMULATE').lower() in ('1', 'true', 'yes')
+            overrides['simulate_radio'] = os.getenv('RAPTORHAB_GND_SIMULATE').lower() in ('1', 'true', 'yes')
         
         if os.getenv('RAPTORHAB_GND_GPS_ENABLED'):
-            config.gps_enabled = os.getenv('RAPTORHAB_GND_GPS_ENABLED').lower() in ('1', 'true', 'yes')
+            overrides['gps_enabled'] = os.getenv('RAPTORHAB_GND_GPS_ENABLED').lower() in ('1', 'true', 'yes')
         
         if os.getenv('RAPTORHAB_GND_GPS_DEVICE'):
-            config.gps_device = os.getenv('RAPTORHAB_GND_GPS_DEVICE')
+            overrides['gps_device'] = os.getenv('RAPTORHAB_GND_GPS_DEVICE')
+        
+        if os.getenv('RAPTORHAB_GND_TILE_CACHE'):
+            overrides['map_tile_cache_size'] = int(os.getenv('RAPTORHAB_GND_TILE_CACHE'))
         
-        return config
+        return cls(**overrides)
+    
+    def with_overrides(self, **overrides) -> 'GroundConfig':
+        """Return a copy of this config with the given fields replaced"""
+        if not overrides:
+            return self
+        return replace(self, **overrides)
 
 
 # Default configuration instance
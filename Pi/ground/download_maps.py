@@ -21,11 +21,25 @@ import sqlite3
 import os
 import sys
 import time
-import math
-import urllib.request
-import urllib.error
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from typing import Tuple, List, Generator, Optional
+from pathlib import Path
+from typing import Tuple, List, Optional
+
+import urllib3
+
+# Add parent to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from ground.tilemath import (
+    NUMPY_AVAILABLE, xyz_to_tms, get_tiles_in_bounds,
+    get_tiles_array, bounds_around_point, iter_tiles,
+)
+from ground.tile_fetch import (
+    OceanTiles, backoff, is_tile_png, retry_delay, server_for_tile,
+)
+from ground.mbtiles_writer import (
+    INSERT_BATCH_SIZE, configure_bulk_load, create_tile_schema, flush_tiles,
+    finish_bulk_load, load_etags,
+)
 
 # Tile server configuration
 TILE_SERVERS = [
@@ -36,80 +50,83 @@ TILE_SERVERS = [
 
 USER_AGENT = 'RaptorHab-OfflineMapDownloader/1.0 (HAB tracking ground station)'
 REQUESTS_PER_SECOND = 2
+REQUEST_TIMEOUT = 30
+MAX_RETRIES = 3
+RETRY_STATUSES = {429, 502, 503, 504}  # Worth retrying after a backoff
+MAX_CONNECTIONS_PER_HOST = 4
+COMMIT_INTERVAL = 1000  # Tiles per SQLite transaction during bulk load
+PROGRESS_INTERVAL = 0.1  # Seconds between progress line redraws
 
+# Shared keep-alive pool: one connection pool per tile host, so each a/b/c
+# server keeps its own MAX_CONNECTIONS_PER_HOST sockets warm instead of
+# handshaking for every tile
+_POOL = urllib3.PoolManager(
+    num_pools=len(TILE_SERVERS),
+    maxsize=MAX_CONNECTIONS_PER_HOST,
+    headers={'User-Agent': USER_AGENT, 'Accept-Encoding': 'gzip', 'Connection': 'keep-alive'},
+)
+# Retries are done by fetch_tile() itself; the pool only follows redirects
+_NO_RETRY = urllib3.Retry(connect=0, read=0, redirect=3)
 
-def lat_lon_to_tile(lat: float, lon: float, zoom: int) -> Tuple[int, int]:
-    """Convert lat/lon to tile coordinates at given zoom level"""
-    lat_rad = math.radians(lat)
-    n = 2 ** zoom
-    x = int((lon + 180) / 360 * n)
-    y = int((1 - math.asinh(math.tan(lat_rad)) / math.pi) / 2 * n)
-    return x, y
-
-
-def get_tiles_in_bounds(
-    west: float, south: float, east: float, north: float,
-    min_zoom: int, max_zoom: int
-) -> Generator[Tuple[int, int, int], None, None]:
-    """Generate all tile coordinates within bounds for zoom range"""
-    for z in range(min_zoom, max_zoom + 1):
-        x_min, y_max = lat_lon_to_tile(north, west, z)
-        x_max, y_min = lat_lon_to_tile(south, east, z)
-        
-        n = 2 ** z
-        x_min = max(0, x_min)
-        x_max = min(n - 1, x_max)
-        y_min = max(0, y_min)
-        y_max = min(n - 1, y_max)
-        
-        for x in range(x_min, x_max + 1):
-            for y in range(y_min, y_max + 1):
-                yield z, x, y
 
-
-def get_tiles_around_point(
-    lat: float, lon: float, radius_km: float,
-    min_zoom: int, max_zoom: int
-) -> Generator[Tuple[int, int, int], None, None]:
-    """Generate tiles within radius of a point"""
-    lat_delta = radius_km / 111
-    lon_delta = radius_km / (111 * math.cos(math.radians(lat)))
+def fetch_tile(z: int, x: int, y: int, server_idx: Optional[int] = None,
+               etag: Optional[str] = None) -> Tuple[int, Optional[bytes], Optional[str]]:
+    """
+    Fetch a single tile from OSM servers.
+    
+    Returns (status, data, etag). When etag is given the request is
+    conditional and an unchanged tile comes back as status 304 with no
+    data. A 200 whose body is not a map tile PNG also comes back with no
+    data. Status is 0 if the request failed outright. Without an explicit
+    server_idx the host is picked by server_for_tile().
+    """
+    if server_idx is None:
+        server_idx = server_for_tile(z, x, y, len(TILE_SERVERS))
+    url = TILE_SERVERS[server_idx % len(TILE_SERVERS)].format(z=z, x=x, y=y)
     
-    west = lon - lon_delta
-    east = lon + lon_delta
-    south = lat - lat_delta
-    north = lat + lat_delta
+    headers = None
+    if etag:
+        headers = {**_POOL.headers, 'If-None-Match': etag}
+    
+    status = 0
+    for attempt in range(MAX_RETRIES + 1):
+        try:
+            response = _POOL.request('GET', url, headers=headers, timeout=REQUEST_TIMEOUT, retries=_NO_RETRY)
+        except urllib3.exceptions.HTTPError:
+            status = 0
+            delay = backoff(attempt)
+        else:
+            status = response.status
+            if status == 200:
+                if is_tile_png(response.data):
+                    return 200, response.data, response.headers.get('ETag')
+                return status, None, None
+            if status not in RETRY_STATUSES:
+                return status, None, None
+            delay = retry_delay(response.headers, attempt)
+        
+        if attempt < MAX_RETRIES:
+            time.sleep(delay)
     
-    yield from get_tiles_in_bounds(west, south, east, north, min_zoom, max_zoom)
+    return status, None, None
 
 
-def download_tile(z: int, x: int, y: int, server_idx: int = 0) -> Optional[bytes]:
+def download_tile(z: int, x: int, y: int, server_idx: Optional[int] = None) -> Optional[bytes]:
     """Download a single tile from OSM servers"""
-    url = TILE_SERVERS[server_idx % len(TILE_SERVERS)].format(z=z, x=x, y=y)
-    req = urllib.request.Request(url, headers={'User-Agent': USER_AGENT})
-    
-    try:
-        with urllib.request.urlopen(req, timeout=30) as response:
-            return response.read()
-    except (urllib.error.URLError, urllib.error.HTTPError):
-        return None
+    return fetch_tile(z, x, y, server_idx)[1]
 
 
 def create_mbtiles(output_path: str, name: str, description: str, 
                    bounds: Tuple[float, float, float, float], min_zoom: int, max_zoom: int):
     """Create a new MBTiles database"""
     conn = sqlite3.connect(output_path)
+    configure_bulk_load(conn)
     cursor = conn.cursor()
     
     cursor.execute('''
         CREATE TABLE IF NOT EXISTS metadata (name TEXT, value TEXT)
     ''')
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS tiles (
-            zoom_level INTEGER, tile_column INTEGER, tile_row INTEGER,
-            tile_data BLOB, PRIMARY KEY (zoom_level, tile_column, tile_row)
-        )
-    ''')
+    create_tile_schema(cursor)
     
     west, south, east, north = bounds
     metadata = [
@@ -124,60 +141,89 @@ def create_mbtiles(output_path: str, name: str, description: str,
     return conn
 
 
-def xyz_to_tms(z: int, y: int) -> int:
-    """Convert XYZ y to TMS y (MBTiles uses TMS convention)"""
-    return (1 << z) - 1 - y
-
-
 def download_tiles_to_mbtiles(
     output_path: str, tiles: List[Tuple[int, int, int]],
     name: str = 'Offline OSM', description: str = 'OpenStreetMap tiles for offline use',
     bounds: Tuple[float, float, float, float] = (-180, -85, 180, 85),
-    min_zoom: int = 0, max_zoom: int = 18, workers: int = 4
+    min_zoom: int = 0, max_zoom: int = 18, workers: int = 4,
+    skip_ocean: bool = False, single_host: bool = False
 ):
     """Download tiles and save to MBTiles"""
     conn = create_mbtiles(output_path, name, description, bounds, min_zoom, max_zoom)
     cursor = conn.cursor()
     
+    # Re-running into an existing file sends conditional requests, so the
+    # server can answer 304 instead of resending unchanged tiles
+    etags = load_etags(conn)
+    
+    ocean = None
+    if skip_ocean:
+        print("Sampling blank ocean tiles...")
+        ocean = OceanTiles.learn(min_zoom, max_zoom, download_tile)
+        print(f"  Ocean skipping enabled for zoom levels: {sorted(ocean.blanks) or 'none'}")
+    
     total = len(tiles)
     downloaded = 0
     failed = 0
-    start_time = time.time()
+    unchanged = 0
+    pending = []
+    seen_images = set()
+    start_time = time.monotonic()
+    last_print = 0.0
     
     print(f"Downloading {total:,} tiles to {output_path}")
     print(f"Using {workers} workers, rate limit: {REQUESTS_PER_SECOND}/sec\n")
     
     min_interval = workers / REQUESTS_PER_SECOND
     
-    for i, (z, x, y) in enumerate(tiles):
-        data = download_tile(z, x, y, i)
+    cursor.execute('BEGIN')
+    server_idx = 0 if single_host else None
+    for z, x, y in iter_tiles(tiles):
+        data = ocean.lookup(z, x, y) if ocean else None
+        if data is not None:
+            status, etag = 200, None
+        else:
+            status, data, etag = fetch_tile(z, x, y, server_idx, etags.get((z, x, y)))
+            time.sleep(min_interval)
         downloaded += 1
         
-        if data:
-            tms_y = xyz_to_tms(z, y)
-            cursor.execute(
-                'INSERT OR REPLACE INTO tiles (zoom_level, tile_column, tile_row, tile_data) VALUES (?, ?, ?, ?)',
-                (z, x, tms_y, data)
-            )
-            if downloaded % 100 == 0:
-                conn.commit()
+        if status == 304:
+            unchanged += 1
+        elif data:
+            pending.append((z, x, xyz_to_tms(z, y), data, etag))
+            if ocean:
+                ocean.record(z, x, y, data)
         else:
             failed += 1
         
-        if downloaded % 50 == 0 or downloaded == total:
-            elapsed = time.time() - start_time
+        if len(pending) >= INSERT_BATCH_SIZE:
+            flush_tiles(cursor, pending, seen_images)
+        
+        if downloaded % COMMIT_INTERVAL == 0:
+            flush_tiles(cursor, pending, seen_images)
+            conn.commit()
+            cursor.execute('BEGIN')
+        
+        now = time.monotonic()
+        if now - last_print >= PROGRESS_INTERVAL or downloaded == total:
+            last_print = now
+            elapsed = now - start_time
             rate = downloaded / elapsed if elapsed > 0 else 0
             eta = (total - downloaded) / rate if rate > 0 else 0
             print(f"\rProgress: {downloaded:,}/{total:,} ({100*downloaded/total:.1f}%) "
-                  f"| {rate:.1f}/sec | ETA: {eta/60:.1f}m | Failed: {failed}", end='')
-        
-        time.sleep(min_interval)
+                  f"| {rate:.1f}/sec | ETA: {eta/60:.1f}m | Failed: {failed}", end='', flush=True)
     
+    flush_tiles(cursor, pending, seen_images)
     conn.commit()
+    finish_bulk_load(conn)
     conn.close()
     
     print(f"\n\nDownload complete!")
     print(f"  Total tiles: {downloaded:,}, Failed: {failed}")
+    if unchanged:
+        print(f"  Unchanged (304): {unchanged:,}")
+    if ocean and ocean.skipped:
+        print(f"  Ocean tiles filled without download: {ocean.skipped:,}")
     print(f"  File size: {os.path.getsize(output_path) / 1024 / 1024:.1f} MB")
 
 
@@ -206,6 +252,11 @@ def main():
     parser.add_argument('--zoom', default='0-8', help='Zoom range: min-max')
     parser.add_argument('--output', '-o', default='world.mbtiles', help='Output file')
     parser.add_argument('--workers', type=int, default=1, help='Number of workers')
+    parser.add_argument('--skip-ocean', action='store_true',
+                        help='Fill open-ocean tiles from a sampled blank tile instead of downloading '
+                             '(may miss small islands that only appear at higher zoom)')
+    parser.add_argument('--single-host', action='store_true',
+                        help='Fetch every tile from the first tile server instead of sharding across all of them')
     
     args = parser.parse_args()
     
@@ -221,9 +272,7 @@ def main():
     elif args.around:
         lat, lon = map(float, args.around.split(','))
         min_zoom, max_zoom = map(int, args.zoom.split('-'))
-        lat_delta = args.radius / 111
-        lon_delta = args.radius / (111 * math.cos(math.radians(lat)))
-        bounds = (lon - lon_delta, lat - lat_delta, lon + lon_delta, lat + lat_delta)
+        bounds = bounds_around_point(lat, lon, args.radius)
         description = f'{args.radius}km around ({lat}, {lon}), zoom {min_zoom}-{max_zoom}'
     else:
         print("Specify --preset, --bounds, or --around")
@@ -233,7 +282,10 @@ def main():
     print(f"Bounds: {bounds}")
     print(f"Zoom: {min_zoom}-{max_zoom}")
     
-    tiles = list(get_tiles_in_bounds(*bounds, min_zoom, max_zoom))
+    if NUMPY_AVAILABLE:
+        tiles = get_tiles_array(*bounds, min_zoom, max_zoom)
+    else:
+        tiles = list(get_tiles_in_bounds(*bounds, min_zoom, max_zoom))
     print(f"Total tiles to download: {len(tiles):,}\n")
     
     if input("Continue? [y/N] ").lower() != 'y':
@@ -241,7 +293,8 @@ def main():
     
     download_tiles_to_mbtiles(
         args.output, tiles, 'Offline OSM', description,
-        bounds, min_zoom, max_zoom, args.workers
+        bounds, min_zoom, max_zoom, args.workers, args.skip_ocean,
+        args.single_host
     )
 
 
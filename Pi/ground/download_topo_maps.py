@@ -27,14 +27,41 @@ import sqlite3
 import os
 import sys
 import time
-import math
-import random
-import urllib.request
-import urllib.error
-from typing import Tuple, List, Generator, Optional
-from concurrent.futures import ThreadPoolExecutor, as_completed
-
-# OpenTopoMap tile servers
+import queue
+import threading
+from typing import Tuple, List, Generator, Optional, Dict
+from concurrent.futures import ThreadPoolExecutor, Future, wait, FIRST_COMPLETED
+from pathlib import Path
+
+import urllib3
+
+try:
+    import httpx
+    import h2  # noqa: F401 - needed by httpx for http2=True
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+# Add parent to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from ground.tilemath import (
+    NUMPY_AVAILABLE, xyz_to_tms, get_tiles_in_bounds,
+    get_tiles_array, bounds_around_point, iter_tiles, tile_key, tile_keys,
+)
+from ground.tile_fetch import (
+    OceanTiles, backoff, is_tile_png, retry_delay, server_for_tile,
+)
+from ground.mbtiles_writer import (
+    INSERT_BATCH_SIZE, configure_bulk_load, create_tile_schema, flush_tiles,
+    finish_bulk_load, load_etags,
+)
+
+if NUMPY_AVAILABLE:
+    import numpy as np
+
+# OpenTopoMap tile servers; tiles are sharded across all entries
+# (see server_for_tile) unless --single-host is given
 TILE_SERVERS = [
     'https://backup.opentopomap.org/{z}/{x}/{y}.png',
 ]
@@ -44,148 +71,147 @@ USER_AGENT = 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36
 TILES_PER_SECOND = 20  # 20 tiles per second with parallel downloads
 REQUEST_TIMEOUT = 15
 MAX_RETRIES = 3
+RETRY_STATUSES = {429, 502, 503, 504}  # Worth retrying after a backoff
 PARALLEL_DOWNLOADS = 10  # Number of concurrent downloads
+SUBMIT_WINDOW = PARALLEL_DOWNLOADS * 4  # Downloads queued on the pool at once
+COMMIT_INTERVAL = 1000  # Tiles per SQLite transaction during bulk load
+WRITE_QUEUE_SIZE = 2048  # Downloaded tiles waiting for the DB writer thread
+PROGRESS_INTERVAL = 0.1  # Seconds between progress line redraws
+PROGRESS_BAR_WIDTH = 30
 
+# Shared keep-alive connection pool - every worker reuses the same TCP+TLS
+# sockets instead of handshaking once per tile
+_POOL = urllib3.PoolManager(
+    num_pools=max(4, len(TILE_SERVERS)),
+    maxsize=PARALLEL_DOWNLOADS,
+    headers={
+        'User-Agent': USER_AGENT,
+        'Accept': 'image/png,image/*,*/*',
+        'Accept-Language': 'en-US,en;q=0.9',
+        'Accept-Encoding': 'gzip',  # urllib3 decodes transparently
+        'Referer': 'https://opentopomap.org/',
+        'Connection': 'keep-alive',
+    },
+)
+# Retries are done by fetch_tile() itself; the pool only follows redirects
+_NO_RETRY = urllib3.Retry(connect=0, read=0, redirect=3)
 
-def lat_lon_to_tile(lat: float, lon: float, zoom: int) -> Tuple[int, int]:
-    """Convert lat/lon to tile coordinates"""
-    lat_rad = math.radians(lat)
-    n = 2 ** zoom
-    x = int((lon + 180) / 360 * n)
-    y = int((1 - math.asinh(math.tan(lat_rad)) / math.pi) / 2 * n)
-    return x, y
-
-
-def count_tiles_for_zoom(zoom: int) -> int:
-    """Count total tiles at a zoom level (worldwide)"""
-    return 4 ** zoom
+# With httpx + h2 installed, requests are multiplexed as HTTP/2 streams over
+# one or two connections per host instead of one socket per worker; servers
+# that only speak HTTP/1.1 are negotiated down automatically via ALPN, so
+# the pool still allows one connection per worker for that fallback
+_H2_CLIENT = None
+_TRANSPORT_ERRORS = (urllib3.exceptions.HTTPError,)
+if HTTP2_AVAILABLE:
+    _H2_CLIENT = httpx.Client(
+        http2=True,
+        # Connection headers are not allowed in HTTP/2
+        headers={k: v for k, v in _POOL.headers.items() if k != 'Connection'},
+        timeout=REQUEST_TIMEOUT,
+        limits=httpx.Limits(max_connections=PARALLEL_DOWNLOADS,
+                            max_keepalive_connections=PARALLEL_DOWNLOADS),
+        follow_redirects=True,
+    )
+    _TRANSPORT_ERRORS += (httpx.HTTPError,)
 
 
-def count_tiles_in_bounds(west: float, south: float, east: float, north: float,
-                          min_zoom: int, max_zoom: int) -> int:
-    """Count tiles within bounds"""
-    total = 0
-    for z in range(min_zoom, max_zoom + 1):
-        n = 2 ** z
-        
-        x_min = int((west + 180) / 360 * n)
-        x_max = int((east + 180) / 360 * n)
-        
-        lat_rad_north = math.radians(min(north, 85.0511))
-        lat_rad_south = math.radians(max(south, -85.0511))
-        
-        y_min = int((1 - math.asinh(math.tan(lat_rad_north)) / math.pi) / 2 * n)
-        y_max = int((1 - math.asinh(math.tan(lat_rad_south)) / math.pi) / 2 * n)
-        
-        x_min = max(0, x_min)
-        x_max = min(n - 1, x_max)
-        y_min = max(0, y_min)
-        y_max = min(n - 1, y_max)
-        
-        total += (x_max - x_min + 1) * (y_max - y_min + 1)
-    return total
+def estimate_size_mb(tile_count: int, avg_tile_kb: float = 15.0) -> float:
+    """Estimate download size in MB (topo tiles average ~15KB)"""
+    return (tile_count * avg_tile_kb) / 1024
 
 
-def get_tiles_in_bounds(west: float, south: float, east: float, north: float,
-                        min_zoom: int, max_zoom: int) -> Generator[Tuple[int, int, int], None, None]:
-    """Generate tile coordinates within bounds"""
-    for z in range(min_zoom, max_zoom + 1):
-        n = 2 ** z
-        
-        # Convert bounds to tile coordinates
-        x_min = int((west + 180) / 360 * n)
-        x_max = int((east + 180) / 360 * n)
-        
-        # Y coordinates (note: lat_to_tile_y decreases as lat increases)
-        lat_rad_north = math.radians(min(north, 85.0511))
-        lat_rad_south = math.radians(max(south, -85.0511))
-        
-        y_min = int((1 - math.asinh(math.tan(lat_rad_north)) / math.pi) / 2 * n)
-        y_max = int((1 - math.asinh(math.tan(lat_rad_south)) / math.pi) / 2 * n)
-        
-        # Clamp to valid range
-        x_min = max(0, x_min)
-        x_max = min(n - 1, x_max)
-        y_min = max(0, y_min)
-        y_max = min(n - 1, y_max)
-        
-        for x in range(x_min, x_max + 1):
-            for y in range(y_min, y_max + 1):
-                yield z, x, y
+def _request(url: str, headers: Optional[Dict[str, str]] = None):
+    """GET url with the shared client, returning (status, body, headers)"""
+    if _H2_CLIENT is not None:
+        response = _H2_CLIENT.get(url, headers=headers)
+        return response.status_code, response.content, response.headers
+    
+    if headers:
+        headers = {**_POOL.headers, **headers}
+    response = _POOL.request('GET', url, headers=headers, timeout=REQUEST_TIMEOUT, retries=_NO_RETRY)
+    return response.status, response.data, response.headers
 
 
-def get_tiles_around_point(lat: float, lon: float, radius_km: float,
-                           min_zoom: int, max_zoom: int) -> Generator[Tuple[int, int, int], None, None]:
-    """Generate tiles within radius of a point"""
-    lat_delta = radius_km / 111.0
-    lon_delta = radius_km / (111.0 * math.cos(math.radians(lat)))
+def fetch_tile(z: int, x: int, y: int, etag: Optional[str] = None,
+               verbose: bool = False, server_idx: Optional[int] = None
+               ) -> Tuple[int, Optional[bytes], Optional[str]]:
+    """
+    Fetch a single tile, retrying transient failures up to MAX_RETRIES times.
+    
+    Returns (status, data, etag). When etag is given the request is
+    conditional and an unchanged tile comes back as status 304 with no
+    data. A 200 whose body is not a map tile PNG also comes back with no
+    data. Status is 0 if the request failed outright. Without an explicit
+    server_idx the host is picked by server_for_tile().
+    """
+    if server_idx is None:
+        server_idx = server_for_tile(z, x, y, len(TILE_SERVERS))
+    url = TILE_SERVERS[server_idx % len(TILE_SERVERS)].format(z=z, x=x, y=y)
     
-    west = lon - lon_delta
-    east = lon + lon_delta
-    south = lat - lat_delta
-    north = lat + lat_delta
+    headers = {'If-None-Match': etag} if etag else None
     
-    yield from get_tiles_in_bounds(west, south, east, north, min_zoom, max_zoom)
+    status = 0
+    for attempt in range(MAX_RETRIES + 1):
+        try:
+            status, data, response_headers = _request(url, headers)
+        except _TRANSPORT_ERRORS as e:
+            if verbose:
+                print(f"  Error: {e}")
+            status = 0
+            delay = backoff(attempt)
+        else:
+            if status == 200:
+                if is_tile_png(data):
+                    return 200, data, response_headers.get('ETag')
+                if verbose:
+                    print(f"  Not a map tile ({len(data)} bytes)")
+                return status, None, None
+            if verbose and status != 304:
+                print(f"  HTTP {status}")
+            if status not in RETRY_STATUSES:
+                return status, None, None
+            delay = retry_delay(response_headers, attempt)
+        
+        if attempt < MAX_RETRIES:
+            time.sleep(delay)
+    
+    return status, None, None
 
 
-def estimate_size_mb(tile_count: int, avg_tile_kb: float = 15.0) -> float:
-    """Estimate download size in MB (topo tiles average ~15KB)"""
-    return (tile_count * avg_tile_kb) / 1024
+def download_tile(z: int, x: int, y: int, verbose: bool = False) -> Optional[bytes]:
+    """Download a single tile"""
+    return fetch_tile(z, x, y, verbose=verbose)[1]
 
 
-def download_tile(z: int, x: int, y: int, retry: int = 0) -> Optional[bytes]:
-    """Download a single tile with retries"""
-    server = TILE_SERVERS[0]
-    url = server.format(z=z, x=x, y=y)
-    
-    req = urllib.request.Request(url, headers={
-        'User-Agent': USER_AGENT,
-        'Accept': 'image/png,image/*,*/*',
-        'Accept-Language': 'en-US,en;q=0.9',
-        'Referer': 'https://opentopomap.org/',
-    })
+def _existing_tile_keys(conn: sqlite3.Connection):
+    """
+    Packed XYZ keys of every tile already in the file.
     
-    try:
-        with urllib.request.urlopen(req, timeout=REQUEST_TIMEOUT) as response:
-            if response.status == 200:
-                return response.read()
-    except urllib.error.HTTPError as e:
-        if e.code == 429 and retry < MAX_RETRIES:
-            time.sleep(5 * (retry + 1))
-            return download_tile(z, x, y, retry + 1)
-        elif e.code == 404:
-            return None
-    except (urllib.error.URLError, TimeoutError, ConnectionResetError):
-        if retry < MAX_RETRIES:
-            time.sleep(2 * (retry + 1))
-            return download_tile(z, x, y, retry + 1)
-    except Exception:
-        if retry < MAX_RETRIES:
-            return download_tile(z, x, y, retry + 1)
-    
-    return None
-
-
-def xyz_to_tms(z: int, y: int) -> int:
-    """Convert XYZ y to TMS y (MBTiles uses TMS)"""
-    return (1 << z) - 1 - y
+    An int64 array when NumPy is available (8 bytes per tile), otherwise a
+    set of ints - either way far smaller than a set of (z, x, y) tuples.
+    """
+    table = 'map' if conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'map'").fetchone() else 'tiles'
+    cursor = conn.execute(
+        'SELECT (zoom_level << 48) | (tile_column << 24) | ((1 << zoom_level) - 1 - tile_row) '
+        f'FROM {table}'
+    )
+    keys = (key for key, in cursor)
+    if NUMPY_AVAILABLE:
+        return np.fromiter(keys, dtype=np.int64)
+    return set(keys)
 
 
 def create_mbtiles(path: str, name: str, description: str,
                    bounds: Tuple[float, float, float, float],
                    min_zoom: int, max_zoom: int) -> sqlite3.Connection:
     """Create MBTiles database"""
-    conn = sqlite3.connect(path)
+    # Handed over to the writer thread once setup is done; never shared concurrently
+    conn = sqlite3.connect(path, check_same_thread=False)
+    configure_bulk_load(conn)
     cursor = conn.cursor()
     
     cursor.execute('CREATE TABLE IF NOT EXISTS metadata (name TEXT, value TEXT)')
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS tiles (
-            zoom_level INTEGER, tile_column INTEGER, tile_row INTEGER,
-            tile_data BLOB, PRIMARY KEY (zoom_level, tile_column, tile_row)
-        )
-    ''')
-    cursor.execute('CREATE INDEX IF NOT EXISTS idx_tiles ON tiles (zoom_level, tile_column, tile_row)')
+    create_tile_schema(cursor)
     
     west, south, east, north = bounds
     metadata = [
@@ -205,48 +231,139 @@ def create_mbtiles(path: str, name: str, description: str,
     return conn
 
 
+def _db_writer(conn: sqlite3.Connection, write_queue: queue.Queue):
+    """
+    Drain (z, x, tms_y, data, etag) items from write_queue into the database.
+    
+    Runs on its own thread so a slow commit never holds up reaping HTTP
+    completions. Stops when it receives None.
+    """
+    cursor = conn.cursor()
+    pending = []
+    seen_images = set()
+    uncommitted = 0
+    item = ()
+    try:
+        cursor.execute('BEGIN')
+        while item is not None:
+            item = write_queue.get()
+            # Take whatever else is already waiting, up to one batch
+            while item is not None:
+                pending.append(item)
+                if len(pending) >= INSERT_BATCH_SIZE:
+                    break
+                try:
+                    item = write_queue.get_nowait()
+                except queue.Empty:
+                    break
+            
+            uncommitted += len(pending)
+            flush_tiles(cursor, pending, seen_images)
+            if uncommitted >= COMMIT_INTERVAL:
+                conn.commit()
+                cursor.execute('BEGIN')
+                uncommitted = 0
+        conn.commit()
+    except Exception as e:
+        print(f"\nDatabase write failed: {e}")
+        # Keep consuming so the download loop does not block on a full queue
+        while item is not None:
+            item = write_queue.get()
+
+
+def _as_downloaded(executor: ThreadPoolExecutor, tiles, etags: Dict[Tuple[int, int, int], str],
+                   ocean: Optional[OceanTiles] = None, server_idx: Optional[int] = None
+                   ) -> Generator[Tuple[Tuple[int, int, int], Future], None, None]:
+    """
+    Yield ((z, x, y), future) as downloads finish.
+    
+    Only SUBMIT_WINDOW downloads are queued at any time, so memory stays
+    flat regardless of job size and Ctrl+C does not have to drain a
+    backlog of already-submitted work. Tiles that ocean can fill in are
+    yielded immediately with an already-completed future.
+    """
+    tile_iter = iter_tiles(tiles)
+    in_flight = {}
+    
+    def fill_window() -> Generator[Tuple[Tuple[int, int, int], Future], None, None]:
+        while len(in_flight) < SUBMIT_WINDOW:
+            tile = next(tile_iter, None)
+            if tile is None:
+                return
+            data = ocean.lookup(*tile) if ocean else None
+            if data is None:
+                in_flight[executor.submit(fetch_tile, *tile, etags.get(tile), server_idx=server_idx)] = tile
+            else:
+                future = Future()
+                future.set_result((200, data, None))
+                yield tile, future
+    
+    yield from fill_window()
+    while in_flight:
+        done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+        for future in done:
+            yield in_flight.pop(future), future
+        yield from fill_window()
+
+
 def download_to_mbtiles(output: str, tiles: List[Tuple[int, int, int]],
                         bounds: Tuple[float, float, float, float],
                         min_zoom: int, max_zoom: int,
                         resume: bool = True,
-                        verbose: bool = False):
+                        verbose: bool = False,
+                        skip_ocean: bool = False,
+                        single_host: bool = False):
     """Download tiles to MBTiles file"""
     
     name = 'OpenTopoMap Offline'
     description = f'OpenTopoMap terrain tiles, zoom {min_zoom}-{max_zoom}'
     
     # Check for existing file to resume
-    existing_tiles = set()
+    existing = None
     if resume and os.path.exists(output):
         print(f"Found existing file, checking for resume...")
         try:
             conn = sqlite3.connect(output)
-            cursor = conn.cursor()
-            cursor.execute('SELECT zoom_level, tile_column, tile_row FROM tiles')
-            for row in cursor:
-                z, x, tms_y = row
-                xyz_y = xyz_to_tms(z, tms_y)  # Convert back to XYZ
-                existing_tiles.add((z, x, xyz_y))
+            existing = _existing_tile_keys(conn)
             conn.close()
-            print(f"  Resuming: {len(existing_tiles):,} tiles already downloaded")
-        except:
-            existing_tiles = set()
+            print(f"  Resuming: {len(existing):,} tiles already downloaded")
+        except sqlite3.Error:
+            existing = None
     
     # Filter out already-downloaded tiles
-    tiles_to_download = [t for t in tiles if t not in existing_tiles]
+    if existing is None or len(existing) == 0:
+        tiles_to_download = tiles
+    elif NUMPY_AVAILABLE:
+        tiles = np.asarray(tiles, dtype=np.int64).reshape(-1, 3)
+        tiles_to_download = tiles[~np.isin(tile_keys(tiles), existing)]
+    else:
+        tiles_to_download = [t for t in tiles if tile_key(*t) not in existing]
     
-    if not tiles_to_download:
+    if len(tiles_to_download) == 0:
         print("All tiles already downloaded!")
         return
     
     conn = create_mbtiles(output, name, description, bounds, min_zoom, max_zoom)
-    cursor = conn.cursor()
+    
+    # Tiles that are fetched again are requested conditionally, so the
+    # server can answer 304 instead of resending unchanged data
+    etags = {} if resume else load_etags(conn)
+    
+    ocean = None
+    if skip_ocean:
+        print("Sampling blank ocean tiles...")
+        ocean = OceanTiles.learn(min_zoom, max_zoom, download_tile)
+        print(f"  Ocean skipping enabled for zoom levels: {sorted(ocean.blanks) or 'none'}")
     
     total = len(tiles_to_download)
     downloaded = 0
     failed = 0
+    unchanged = 0
     bytes_downloaded = 0
-    start_time = time.time()
+    start_time = time.monotonic()
+    last_print = 0.0
+    bar_full = '█' * PROGRESS_BAR_WIDTH
+    bar_empty = '░' * PROGRESS_BAR_WIDTH
     
     print(f"\nDownloading {total:,} tiles to {output}")
     print(f"Parallel downloads: {PARALLEL_DOWNLOADS}")
@@ -254,57 +371,63 @@ def download_to_mbtiles(output: str, tiles: List[Tuple[int, int, int]],
     print(f"Estimated size: {estimate_size_mb(total):.0f} MB")
     print("\nPress Ctrl+C to pause (progress is saved)\n")
     
+    write_queue = queue.Queue(maxsize=WRITE_QUEUE_SIZE)
+    writer = threading.Thread(target=_db_writer, args=(conn, write_queue), daemon=True)
+    writer.start()
+    finished = False
+    
     try:
         with ThreadPoolExecutor(max_workers=PARALLEL_DOWNLOADS) as executor:
-            future_to_tile = {
-                executor.submit(download_tile, z, x, y): (z, x, y) 
-                for z, x, y in tiles_to_download
-            }
-            
-            for future in as_completed(future_to_tile):
-                z, x, y = future_to_tile[future]
+            for (z, x, y), future in _as_downloaded(executor, tiles_to_download, etags, ocean,
+                                                     0 if single_host else None):
                 downloaded += 1
                 
                 try:
-                    data = future.result()
-                    if data:
-                        tms_y = xyz_to_tms(z, y)
-                        cursor.execute(
-                            'INSERT OR REPLACE INTO tiles (zoom_level, tile_column, tile_row, tile_data) VALUES (?, ?, ?, ?)',
-                            (z, x, tms_y, data)
-                        )
+                    status, data, etag = future.result()
+                    if status == 304:
+                        unchanged += 1
+                    elif data:
+                        write_queue.put((z, x, xyz_to_tms(z, y), data, etag))
                         bytes_downloaded += len(data)
+                        if ocean:
+                            ocean.record(z, x, y, data)
                     else:
                         failed += 1
                 except Exception:
                     failed += 1
                 
-                if downloaded % 100 == 0:
-                    conn.commit()
-                
-                if downloaded % 20 == 0 or downloaded == total:
-                    elapsed = time.time() - start_time
+                now = time.monotonic()
+                if now - last_print >= PROGRESS_INTERVAL or downloaded == total:
+                    last_print = now
+                    elapsed = now - start_time
                     rate = downloaded / elapsed if elapsed > 0 else 0
                     eta_min = (total - downloaded) / rate / 60 if rate > 0 else 0
                     mb = bytes_downloaded / 1024 / 1024
                     
-                    bar_width = 30
                     progress = downloaded / total
-                    filled = int(bar_width * progress)
-                    bar = '█' * filled + '░' * (bar_width - filled)
+                    filled = int(PROGRESS_BAR_WIDTH * progress)
+                    bar = bar_full[:filled] + bar_empty[filled:]
                     
                     print(f"\r[{bar}] {downloaded:,}/{total:,} ({100*progress:.1f}%) "
                           f"| {mb:.1f}MB | {rate:.1f}/s | ETA: {eta_min:.0f}m | Failed: {failed}", end='', flush=True)
+        finished = True
     
     except KeyboardInterrupt:
         print("\n\n⏸ Paused! Progress saved. Run again to resume.")
     
     finally:
-        conn.commit()
+        write_queue.put(None)
+        writer.join()
+        if finished:
+            finish_bulk_load(conn)
         conn.close()
     
     print(f"\n\n✓ Download complete!")
     print(f"  Tiles: {downloaded:,} downloaded, {failed} failed/empty")
+    if unchanged:
+        print(f"  Unchanged (304): {unchanged:,}")
+    if ocean and ocean.skipped:
+        print(f"  Ocean tiles filled without download: {ocean.skipped:,}")
     print(f"  Size: {os.path.getsize(output) / 1024 / 1024:.1f} MB")
 
 
@@ -336,6 +459,11 @@ Examples:
                         help='Start fresh instead of resuming')
     parser.add_argument('--verbose', '-v', action='store_true',
                         help='Show detailed download progress')
+    parser.add_argument('--skip-ocean', action='store_true',
+                        help='Fill open-ocean tiles from a sampled blank tile instead of downloading '
+                             '(may miss small islands that only appear at higher zoom)')
+    parser.add_argument('--single-host', action='store_true',
+                        help='Fetch every tile from the first tile server instead of sharding across all of them')
     parser.add_argument('--test', action='store_true',
                         help='Test mode: try downloading just 5 tiles to verify connectivity')
     
@@ -347,9 +475,7 @@ Examples:
     # Determine bounds
     if args.around:
         lat, lon = map(float, args.around.split(','))
-        lat_delta = args.radius / 111.0
-        lon_delta = args.radius / (111.0 * math.cos(math.radians(lat)))
-        bounds = (lon - lon_delta, lat - lat_delta, lon + lon_delta, lat + lat_delta)
+        bounds = bounds_around_point(lat, lon, args.radius)
         region_desc = f"{args.radius}km around ({lat}, {lon})"
     elif args.bounds:
         bounds = tuple(map(float, args.bounds.split(',')))
@@ -359,7 +485,10 @@ Examples:
         region_desc = "worldwide"
     
     # Count tiles
-    tiles = list(get_tiles_in_bounds(*bounds, min_zoom, max_zoom))
+    if NUMPY_AVAILABLE:
+        tiles = get_tiles_array(*bounds, min_zoom, max_zoom)
+    else:
+        tiles = list(get_tiles_in_bounds(*bounds, min_zoom, max_zoom))
     tile_count = len(tiles)
     est_mb = estimate_size_mb(tile_count)
     est_hours = tile_count / TILES_PER_SECOND / 3600
@@ -378,7 +507,7 @@ Examples:
     # Test mode - just try a few tiles
     if args.test:
         print("\n🧪 TEST MODE: Trying to download 5 tiles...\n")
-        test_tiles = tiles[:5]
+        test_tiles = list(iter_tiles(tiles[:5]))
         success = 0
         for i, (z, x, y) in enumerate(test_tiles):
             print(f"Test {i+1}/5: z={z} x={x} y={y}")
@@ -416,7 +545,9 @@ Examples:
         args.output, tiles, bounds,
         min_zoom, max_zoom,
         resume=not args.no_resume,
-        verbose=args.verbose
+        verbose=args.verbose,
+        skip_ocean=args.skip_ocean,
+        single_host=args.single_host
     )
 
 
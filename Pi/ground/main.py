@@ -9,14 +9,30 @@ Note: Command transmission to airborne unit is not supported.
 All airborne configuration must be done via config file on the airborne unit.
 """
 
+import os
+
+# Opt-in green threads for the web server (RAPTORHAB_GND_ASYNC=eventlet).
+# This turns every station thread - receiver, decoder, GPS, database flush -
+# into a green thread on one OS thread, so a blocking C call stalls them all.
+# Must run before anything imports socket or threading.
+if os.getenv('RAPTORHAB_GND_ASYNC', 'threading') == 'eventlet':
+    try:
+        import eventlet
+        eventlet.monkey_patch()
+    except ImportError:
+        pass
+
 import argparse
+import functools
 import logging
+import logging.handlers
 import math
-import os
+import queue
 import signal
 import sys
 import time
 import threading
+from dataclasses import dataclass
 from pathlib import Path
 from typing import Optional, Tuple
 
@@ -37,8 +53,144 @@ try:
 except ImportError:
     GPS_AVAILABLE = False
 
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
+EMIT_QUEUE_SIZE = 256  # Web events waiting for the emit thread
+
+# Writes log records to the file/console handlers; started by setup_logging()
+_log_listener: Optional[logging.handlers.QueueListener] = None
+
+
+EARTH_RADIUS_M = 6371000.0
+_DEG2RAD = math.pi / 180.0
+_RAD2DEG = 180.0 / math.pi
+
+
+# The geometry kernels below are compiled with numba when it is installed;
+# without it they run as ordinary Python
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    
+    def njit(*args, **kwargs):
+        """Stand-in for numba.njit that leaves the function as-is"""
+        return lambda func: func
+
+
+@njit(cache=True, fastmath=True)
+def _haversine_nb(lat1, lon1, lat2, lon2):
+    """Kernel for haversine_distance()"""
+    phi1 = lat1 * _DEG2RAD
+    phi2 = lat2 * _DEG2RAD
+    delta_phi = (lat2 - lat1) * _DEG2RAD
+    delta_lambda = (lon2 - lon1) * _DEG2RAD
+    
+    a = math.sin(delta_phi / 2) ** 2 + \
+        math.cos(phi1) * math.cos(phi2) * math.sin(delta_lambda / 2) ** 2
+    c = 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
+    
+    return EARTH_RADIUS_M * c
+
+
+@njit(cache=True, fastmath=True)
+def _bearing_nb(lat1, lon1, lat2, lon2):
+    """Kernel for calculate_bearing()"""
+    phi1 = lat1 * _DEG2RAD
+    phi2 = lat2 * _DEG2RAD
+    delta_lambda = (lon2 - lon1) * _DEG2RAD
+    
+    x = math.sin(delta_lambda) * math.cos(phi2)
+    y = math.cos(phi1) * math.sin(phi2) - \
+        math.sin(phi1) * math.cos(phi2) * math.cos(delta_lambda)
+    
+    bearing = math.atan2(x, y) * _RAD2DEG
+    return (bearing + 360) % 360
+
+
+@njit(cache=True, fastmath=True)
+def _elev_nb(ground_lat, ground_lon, ground_alt, target_lat, target_lon, target_alt):
+    """Kernel for calculate_elevation_angle()"""
+    # Haversine inlined rather than calling _haversine_nb, which would go
+    # back through the dispatcher for such a small kernel
+    phi1 = ground_lat * _DEG2RAD
+    phi2 = target_lat * _DEG2RAD
+    delta_phi = (target_lat - ground_lat) * _DEG2RAD
+    delta_lambda = (target_lon - ground_lon) * _DEG2RAD
+    
+    a = math.sin(delta_phi / 2) ** 2 + \
+        math.cos(phi1) * math.cos(phi2) * math.sin(delta_lambda / 2) ** 2
+    horizontal_distance = EARTH_RADIUS_M * 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
+    altitude_diff = target_alt - ground_alt
+    
+    if horizontal_distance < 1:  # Avoid division by zero
+        return 90.0 if altitude_diff > 0 else -90.0
+    
+    return math.atan2(altitude_diff, horizontal_distance) * _RAD2DEG
+
+
+@njit(cache=True, fastmath=True)
+def _to_unit_vec(lat, lon):
+    """Earth-centred unit vector (x, y, z) for a lat/lon in degrees"""
+    phi = lat * _DEG2RAD
+    lam = lon * _DEG2RAD
+    cos_phi = math.cos(phi)
+    return cos_phi * math.cos(lam), cos_phi * math.sin(lam), math.sin(phi)
+
+
+@njit(cache=True, fastmath=True)
+def _tracking_kernel(u, lat, lon, altitude_diff):
+    """
+    Distance (m), bearing and elevation (degrees) from ground unit vector u to a lat/lon
+    
+    u comes from _to_unit_vec(). Distance is atan2(|u x v|, u . v), which
+    stays accurate for both very close and nearly antipodal points. Bearing
+    projects v onto the local east and north directions at u, reusing the
+    z component of the cross product and part of the dot product.
+    """
+    phi = lat * _DEG2RAD
+    lam = lon * _DEG2RAD
+    cos_phi = math.cos(phi)
+    v0 = cos_phi * math.cos(lam)
+    v1 = cos_phi * math.sin(lam)
+    v2 = math.sin(phi)
+    
+    cx = u[1] * v2 - u[2] * v1
+    cy = u[2] * v0 - u[0] * v2
+    cz = u[0] * v1 - u[1] * v0
+    dot_xy = u[0] * v0 + u[1] * v1
+    distance = EARTH_RADIUS_M * math.atan2(math.sqrt(cx * cx + cy * cy + cz * cz),
+                                           dot_xy + u[2] * v2)
+    
+    north = (u[0] * u[0] + u[1] * u[1]) * v2 - u[2] * dot_xy
+    bearing = (math.atan2(cz, north) * _RAD2DEG + 360) % 360
+    
+    if distance < 1:  # Avoid division by zero
+        elevation = 90.0 if altitude_diff > 0 else -90.0
+    else:
+        elevation = math.atan2(altitude_diff, distance) * _RAD2DEG
+    
+    return distance, bearing, elevation
+
+
+@functools.lru_cache(maxsize=256)
+def _ground_unit_vec(lat_q: int, lon_q: int) -> Tuple[float, float, float]:
+    """
+    _to_unit_vec() of a position quantized to 1e-5 degrees
+    
+    Keeps GPS jitter on a stationary ground station from redoing the trig
+    on every fix. 1e-5 degrees is about 1 m, well inside the error of
+    the spherical earth model the tracking maths uses anyway.
+    """
+    return _to_unit_vec(lat_q * 1e-5, lon_q * 1e-5)
+
 
 def haversine_distance(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
     """
@@ -51,18 +203,7 @@ def haversine_distance(lat1: float, lon1: float, lat2: float, lon2: float) -> fl
     Returns:
         Distance in meters
     """
-    R = 6371000  # Earth radius in meters
-    
-    phi1 = math.radians(lat1)
-    phi2 = math.radians(lat2)
-    delta_phi = math.radians(lat2 - lat1)
-    delta_lambda = math.radians(lon2 - lon1)
-    
-    a = math.sin(delta_phi / 2) ** 2 + \
-        math.cos(phi1) * math.cos(phi2) * math.sin(delta_lambda / 2) ** 2
-    c = 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
-    
-    return R * c
+    return _haversine_nb(float(lat1), float(lon1), float(lat2), float(lon2))
 
 
 def calculate_bearing(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
@@ -76,16 +217,7 @@ def calculate_bearing(lat1: float, lon1: float, lat2: float, lon2: float) -> flo
     Returns:
         Bearing in degrees (0-360, where 0=North, 90=East)
     """
-    phi1 = math.radians(lat1)
-    phi2 = math.radians(lat2)
-    delta_lambda = math.radians(lon2 - lon1)
-    
-    x = math.sin(delta_lambda) * math.cos(phi2)
-    y = math.cos(phi1) * math.sin(phi2) - \
-        math.sin(phi1) * math.cos(phi2) * math.cos(delta_lambda)
-    
-    bearing = math.degrees(math.atan2(x, y))
-    return (bearing + 360) % 360
+    return _bearing_nb(float(lat1), float(lon1), float(lat2), float(lon2))
 
 
 def calculate_elevation_angle(ground_lat: float, ground_lon: float, ground_alt: float,
@@ -100,14 +232,65 @@ def calculate_elevation_angle(ground_lat: float, ground_lon: float, ground_alt:
     Returns:
         Elevation angle in degrees (0=horizon, 90=overhead)
     """
-    horizontal_distance = haversine_distance(ground_lat, ground_lon, target_lat, target_lon)
-    altitude_diff = target_alt - ground_alt
+    return _elev_nb(float(ground_lat), float(ground_lon), float(ground_alt),
+                    float(target_lat), float(target_lon), float(target_alt))
+
+
+def warm_up_kernels():
+    """Compile the numba tracking kernels ahead of first use (no-op without numba)"""
+    if not NUMBA_AVAILABLE:
+        return
+    start = time.monotonic()
+    u = _to_unit_vec(0.0, 0.0)
+    _tracking_kernel(u, 1.0, 1.0, 100.0)
+    haversine_distance(0.0, 0.0, 1.0, 1.0)
+    calculate_bearing(0.0, 0.0, 1.0, 1.0)
+    logger.debug("Tracking kernels compiled in %.2fs", time.monotonic() - start)
+
+
+def haversine_distance_vec(lat1: float, lon1: float, lat2, lon2) -> 'np.ndarray':
+    """
+    Vectorized haversine_distance from one point to many
     
-    if horizontal_distance < 1:  # Avoid division by zero
-        return 90.0 if altitude_diff > 0 else -90.0
+    Args:
+        lat1, lon1: First point (degrees)
+        lat2, lon2: Arrays of second points (degrees)
+        
+    Returns:
+        Array of distances in meters
+    """
+    phi1 = lat1 * _DEG2RAD
+    phi2 = np.radians(lat2)
+    delta_phi = phi2 - phi1
+    delta_lambda = np.radians(lon2) - lon1 * _DEG2RAD
+    
+    a = np.sin(delta_phi / 2) ** 2 + \
+        math.cos(phi1) * np.cos(phi2) * np.sin(delta_lambda / 2) ** 2
+    c = 2 * np.arctan2(np.sqrt(a), np.sqrt(1 - a))
+    
+    return EARTH_RADIUS_M * c
+
+
+def calculate_bearing_vec(lat1: float, lon1: float, lat2, lon2) -> 'np.ndarray':
+    """
+    Vectorized calculate_bearing from one point to many
+    
+    Args:
+        lat1, lon1: From point (degrees)
+        lat2, lon2: Arrays of to points (degrees)
+        
+    Returns:
+        Array of bearings in degrees (0-360, where 0=North, 90=East)
+    """
+    phi1 = lat1 * _DEG2RAD
+    phi2 = np.radians(lat2)
+    delta_lambda = np.radians(lon2) - lon1 * _DEG2RAD
+    
+    x = np.sin(delta_lambda) * np.cos(phi2)
+    y = math.cos(phi1) * np.sin(phi2) - \
+        math.sin(phi1) * np.cos(phi2) * np.cos(delta_lambda)
     
-    elevation = math.degrees(math.atan2(altitude_diff, horizontal_distance))
-    return elevation
+    return (np.degrees(np.arctan2(x, y)) + 360) % 360
 
 
 def setup_logging(log_path: str, level: int = logging.INFO, name: str = "raptorhab"):
@@ -134,11 +317,21 @@ def setup_logging(log_path: str, level: int = logging.INFO, name: str = "raptorh
     console_handler.setLevel(level)
     console_handler.setFormatter(console_formatter)
     
-    # Root logger
+    # Root logger - at the requested level, so records below it are dropped
+    # before any handler formats them (use --log-level DEBUG for debug output).
+    # QueueHandler merges the message and any traceback in the logging
+    # thread; the listener thread applies the handler formatters and does
+    # the file/console writes.
+    global _log_listener
+    log_queue = queue.Queue(-1)
+    _log_listener = logging.handlers.QueueListener(
+        log_queue, file_handler, console_handler, respect_handler_level=True
+    )
+    _log_listener.start()
+    
     root_logger = logging.getLogger()
-    root_logger.setLevel(logging.DEBUG)
-    root_logger.addHandler(file_handler)
-    root_logger.addHandler(console_handler)
+    root_logger.setLevel(level)
+    root_logger.addHandler(logging.handlers.QueueHandler(log_queue))
     
     # Reduce noise from libraries
     logging.getLogger('werkzeug').setLevel(logging.WARNING)
@@ -146,6 +339,27 @@ def setup_logging(log_path: str, level: int = logging.INFO, name: str = "raptorh
     logging.getLogger('socketio').setLevel(logging.WARNING)
 
 
+def stop_logging():
+    """Write out queued log records and stop the listener thread"""
+    global _log_listener
+    if _log_listener is not None:
+        _log_listener.stop()
+        _log_listener = None
+
+
+@dataclass(frozen=True)
+class _GroundCache:
+    """
+    Ground GPS fix plus values derived from it
+    
+    Published by swapping the whole (frozen) object in one attribute
+    assignment and never modified afterwards, so readers can take a
+    consistent snapshot without a lock.
+    """
+    gps: 'GPSData'
+    unit_vec: Optional[Tuple[float, float, float]]  # None without a valid fix
+
+
 class GroundStation:
     """
     Main ground station controller
@@ -174,28 +388,37 @@ class GroundStation:
         self._web: Optional[WebServer] = None
         self._gps: Optional[GPS] = None
         
-        # Current ground station GPS data
-        self._ground_gps: Optional[GPSData] = None
-        self._ground_gps_lock = threading.Lock()
+        # Current ground station GPS data (see _GroundCache for the snapshot rules)
+        self._ground: Optional[_GroundCache] = None
+        
+        # Web events are pushed from a worker thread so receiver/decoder
+        # callbacks never wait on JSON encoding or Socket.IO clients
+        self._emit_queue: queue.Queue = queue.Queue(maxsize=EMIT_QUEUE_SIZE)
+        self._emit_thread: Optional[threading.Thread] = None
+        self._emit_dropped = 0
+        
+        # Last get_tracking_info() result and the inputs it was computed from;
+        # web clients poll faster than either position changes
+        self._tracking_cache: Optional[Tuple[tuple, dict]] = None
         
         # State
         self._running = False
         self._shutdown_event = threading.Event()
         
         # Statistics
-        self._start_time: float = 0
+        self._start_time: float = 0  # time.monotonic() at start()
     
     def start(self):
         """Start the ground station"""
         logger.info("=" * 60)
         logger.info("RaptorHab Ground Station Starting")
-        logger.info(f"Callsign: {self.config.callsign}")
-        logger.info(f"Frequency: {self.config.frequency_mhz} MHz")
-        logger.info(f"Simulation mode: {self.simulate}")
+        logger.info("Callsign: %s", self.config.callsign)
+        logger.info("Frequency: %s MHz", self.config.frequency_mhz)
+        logger.info("Simulation mode: %s", self.simulate)
         logger.info("Note: Receive-only mode (no command transmission)")
         logger.info("=" * 60)
         
-        self._start_time = time.time()
+        self._start_time = time.monotonic()
         self._running = True
         
         try:
@@ -205,7 +428,7 @@ class GroundStation:
         except KeyboardInterrupt:
             logger.info("Keyboard interrupt received")
         except Exception as e:
-            logger.critical(f"Fatal error: {e}", exc_info=True)
+            logger.critical("Fatal error: %s", e, exc_info=True)
         finally:
             self._cleanup()
     
@@ -241,7 +464,7 @@ class GroundStation:
         
         # Set telemetry session_id to match image storage session
         self._telemetry.set_session_id(self._storage.session_id)
-        logger.info(f"Session ID: {self._storage.session_id}")
+        logger.info("Session ID: %s", self._storage.session_id)
         
         # Initialize fountain decoder
         logger.info("Initializing fountain decoder...")
@@ -293,7 +516,7 @@ class GroundStation:
                 callback=self._on_ground_gps_update
             )
             if self._gps.init():
-                logger.info(f"Ground GPS initialized on {self.config.gps_device}")
+                logger.info("Ground GPS initialized on %s", self.config.gps_device)
             else:
                 logger.warning("Ground GPS initialization failed")
                 self._gps = None
@@ -322,6 +545,8 @@ class GroundStation:
         
         # Start web server
         if self._web:
+            self._emit_thread = threading.Thread(target=self._emit_worker, daemon=True)
+            self._emit_thread.start()
             self._web.start()
         
         logger.info("All components started")
@@ -330,30 +555,25 @@ class GroundStation:
         """Main control loop"""
         logger.info("Entering main loop")
         
-        # Status update interval
+        # Status update interval. This is also when the decoder drops
+        # timed-out images (get_status, called by _log_status, triggers the
+        # cleanup); image timeouts are minutes, so a 10s sweep is plenty
         status_interval = 10.0
-        last_status = time.time()
+        # Interval maths uses the monotonic clock so NTP steps can't stall it
+        next_status = time.monotonic() + status_interval
         
         while self._running:
             try:
-                # Wait with timeout
-                self._shutdown_event.wait(timeout=1.0)
-                
-                if self._shutdown_event.is_set():
+                # Sleep until the next status update is due, or until shutdown
+                if self._shutdown_event.wait(timeout=max(0.0, next_status - time.monotonic())):
                     break
                 
-                # Periodic status update
-                now = time.time()
-                if now - last_status >= status_interval:
-                    self._log_status()
-                    last_status = now
-                
-                # Check decoder for timed-out images (get_status triggers internal cleanup)
-                if self._decoder:
-                    self._decoder.get_status()
+                now = time.monotonic()
+                next_status = now + status_interval
+                self._log_status(now)
                 
             except Exception as e:
-                logger.error(f"Main loop error: {e}")
+                logger.error("Main loop error: %s", e)
         
         logger.info("Exiting main loop")
     
@@ -361,6 +581,13 @@ class GroundStation:
         """Cleanup resources"""
         logger.info("Cleaning up...")
         
+        if self._emit_thread:
+            try:
+                self._emit_queue.put(None, timeout=1.0)
+            except queue.Full:
+                pass
+            self._emit_thread.join(timeout=2.0)
+        
         if self._web:
             self._web.stop()
         
@@ -380,32 +607,40 @@ class GroundStation:
             self._storage.close()
         
         logger.info("Cleanup complete")
+        stop_logging()
     
     def _on_ground_gps_update(self, gps_data: GPSData):
         """Callback for ground station GPS updates"""
-        with self._ground_gps_lock:
-            self._ground_gps = gps_data
+        unit_vec = None
+        if gps_data.position_valid:
+            # A stationary station reports (nearly) the same position every
+            # update, so the unit vector almost always comes from the cache
+            unit_vec = _ground_unit_vec(round(gps_data.latitude * 1e5),
+                                        round(gps_data.longitude * 1e5))
+        
+        # Single reference assignment - atomic, so no lock is needed
+        self._ground = _GroundCache(gps_data, unit_vec)
         if gps_data.position_valid:
-            logger.debug(f"Ground GPS update: {gps_data.latitude:.6f}, {gps_data.longitude:.6f}")
+            logger.debug("Ground GPS update: %.6f, %.6f", gps_data.latitude, gps_data.longitude)
     
     def get_ground_position(self) -> Optional[GPSData]:
         """Get current ground station GPS position"""
-        with self._ground_gps_lock:
-            return self._ground_gps
+        ground = self._ground
+        return ground.gps if ground else None
     
     def get_tracking_info(self) -> Optional[dict]:
         """
         Get tracking info (distance, bearing, elevation) to airborne unit
         
         Returns:
-            Dict with distance_m, bearing_deg, elevation_deg or None if unavailable
+            Dict with distance_m, bearing_deg, elevation_deg or None if unavailable.
+            The dict is shared between calls with the same fixes; don't modify it.
         """
-        # Get ground position
-        with self._ground_gps_lock:
-            ground = self._ground_gps
-        
-        if ground is None or not ground.position_valid:
+        # Get ground position (one read of the snapshot, then local only)
+        ground_cache = self._ground
+        if ground_cache is None or ground_cache.unit_vec is None:
             return None
+        ground = ground_cache.gps
         
         # Get latest airborne position from telemetry
         if self._telemetry is None:
@@ -415,23 +650,21 @@ class GroundStation:
         if airborne is None or airborne.latitude == 0:
             return None
         
-        # Calculate tracking info
-        distance = haversine_distance(
-            ground.latitude, ground.longitude,
-            airborne.latitude, airborne.longitude
-        )
-        
-        bearing = calculate_bearing(
-            ground.latitude, ground.longitude,
-            airborne.latitude, airborne.longitude
-        )
-        
-        elevation = calculate_elevation_angle(
-            ground.latitude, ground.longitude, ground.altitude,
-            airborne.latitude, airborne.longitude, airborne.altitude
+        # Same fixes as last time - hand back the previous result
+        key = (ground.last_update, airborne.received_at, ground.altitude, airborne.altitude)
+        cached = self._tracking_cache
+        if cached is not None and cached[0] == key:
+            return cached[1]
+        
+        # Calculate tracking info in one kernel call; the ground unit vector
+        # comes precomputed from the GPS callback
+        distance, bearing, elevation = _tracking_kernel(
+            ground_cache.unit_vec,
+            float(airborne.latitude), float(airborne.longitude),
+            float(airborne.altitude - ground.altitude),
         )
         
-        return {
+        result = {
             'distance_m': distance,
             'distance_km': distance / 1000,
             'bearing_deg': bearing,
@@ -441,30 +674,88 @@ class GroundStation:
             'ground_alt': ground.altitude,
             'ground_sats': ground.satellites,
         }
+        # Single reference assignment; a racing caller at worst recomputes
+        self._tracking_cache = (key, result)
+        return result
+    
+    def add_tracking_to_track(self, track: list) -> list:
+        """
+        Add distance_m and bearing_deg from the ground station to each track point
+        
+        Args:
+            track: List of {lat, lon, ...} dicts, as returned by get_track()
+            
+        Returns:
+            The same list; left unchanged if there is no ground GPS fix
+        """
+        ground = self.get_ground_position()
+        if not track or ground is None or not ground.position_valid:
+            return track
+        
+        if NUMPY_AVAILABLE:
+            lats = np.fromiter((p['lat'] for p in track), dtype=np.float64, count=len(track))
+            lons = np.fromiter((p['lon'] for p in track), dtype=np.float64, count=len(track))
+            distances = haversine_distance_vec(ground.latitude, ground.longitude, lats, lons).tolist()
+            bearings = calculate_bearing_vec(ground.latitude, ground.longitude, lats, lons).tolist()
+        else:
+            distances = [haversine_distance(ground.latitude, ground.longitude, p['lat'], p['lon'])
+                         for p in track]
+            bearings = [calculate_bearing(ground.latitude, ground.longitude, p['lat'], p['lon'])
+                        for p in track]
+        
+        for point, distance, bearing in zip(track, distances, bearings):
+            point['distance_m'] = distance
+            point['bearing_deg'] = bearing
+        return track
+    
+    def _queue_emit(self, func, *args):
+        """Hand a web emit to the emit thread; dropped (and counted) if it has fallen behind"""
+        try:
+            self._emit_queue.put_nowait((func, args))
+        except queue.Full:
+            self._emit_dropped += 1
+            if self._emit_dropped % 100 == 1:
+                logger.warning("Web emit queue full, %d events dropped so far", self._emit_dropped)
+    
+    def _emit_worker(self):
+        """Push queued events to web clients until a None sentinel arrives"""
+        while True:
+            item = self._emit_queue.get()
+            if item is None:
+                break
+            func, args = item
+            try:
+                func(*args)
+            except Exception as e:
+                logger.error("Web emit error: %s", e)
+    
+    def _emit_telemetry(self, point: TelemetryPoint):
+        """Serialize and push a telemetry point (runs on the emit thread)"""
+        self._web.emit_telemetry(point.to_dict())
     
     def _on_telemetry(self, point: TelemetryPoint):
         """Callback for new telemetry"""
         # Push to web clients
         if self._web:
-            self._web.emit_telemetry(point.to_dict())
+            self._queue_emit(self._emit_telemetry, point)
     
     def _on_alert(self, alert_type: str, message: str, data):
         """Callback for alerts"""
-        logger.warning(f"ALERT [{alert_type}]: {message}")
+        logger.warning("ALERT [%s]: %s", alert_type, message)
         
         if self._web:
-            self._web.emit_alert(alert_type, message, data)
+            self._queue_emit(self._web.emit_alert, alert_type, message, data)
     
     def _on_image_complete(self, image_id: int, image_data: bytes, metadata: ImageMetadata):
         """Callback for completed image"""
-        logger.info(f"Image {image_id} complete: {len(image_data)} bytes")
+        logger.info("Image %d complete: %d bytes", image_id, len(image_data))
         
         # Store image
         if self._storage:
             stored = self._storage.store_image(image_id, image_data, metadata)
             
             if stored and self._web:
-                self._web.emit_image_complete(image_id, {
+                self._queue_emit(self._web.emit_image_complete, image_id, {
                     'session_id': self._storage.session_id,
                     'width': metadata.width,
                     'height': metadata.height,
@@ -483,11 +774,18 @@ class GroundStation:
     
     def _on_text_message(self, message: str):
         """Callback for text messages"""
-        logger.info(f"Text message: {message}")
+        logger.info("Text message: %s", message)
     
-    def _log_status(self):
-        """Log current status"""
-        uptime = time.time() - self._start_time
+    def _log_status(self, now: float):
+        """Log current status (now is a time.monotonic() reading)"""
+        # Gathering the stats is the expensive part, skip it if INFO is off
+        # (but still let the decoder sweep timed-out images)
+        if not logger.isEnabledFor(logging.INFO):
+            if self._decoder:
+                self._decoder.get_status()
+            return
+        
+        uptime = now - self._start_time
         
         stats = []
         
@@ -506,13 +804,16 @@ class GroundStation:
             dec_stats = self._decoder.get_status()
             stats.append(f"Imgs:{dec_stats['completed_images']}")
         
-        logger.info(f"Status [{uptime:.0f}s] " + " | ".join(stats))
+        if self._emit_dropped:
+            stats.append(f"WebDrop:{self._emit_dropped}")
+        
+        logger.info("Status [%.0fs] %s", uptime, " | ".join(stats))
     
     def _get_status(self) -> dict:
         """Get current status as dictionary"""
         return {
             'time': time.time(),
-            'uptime': time.time() - self._start_time,
+            'uptime': time.monotonic() - self._start_time,
             'receiver': self._receiver.get_stats() if self._receiver else {},
             'telemetry': self._telemetry.get_flight_stats() if self._telemetry else {},
             'decoder': self._decoder.get_status() if self._decoder else {},
@@ -528,7 +829,7 @@ class GroundStation:
 
 def signal_handler(signum, frame, station: GroundStation):
     """Handle shutdown signals"""
-    logger.info(f"Received signal {signum}")
+    logger.info("Received signal %s", signum)
     station.request_shutdown()
 
 
@@ -591,27 +892,32 @@ def main():
     # Load configuration
     config = GroundConfig.from_env()
     
-    # Apply command line overrides
+    # Apply command line overrides in one go
+    overrides = {}
     if args.callsign:
-        config.callsign = args.callsign
+        overrides['callsign'] = args.callsign
     if args.frequency:
-        config.frequency_mhz = args.frequency
+        overrides['frequency_mhz'] = args.frequency
     if args.web_port:
-        config.web_port = args.web_port
+        overrides['web_port'] = args.web_port
     if args.no_web:
-        config.enable_web = False
+        overrides['enable_web'] = False
     if args.data_path:
-        config.data_path = args.data_path
-        config.image_path = os.path.join(args.data_path, "images")
-        config.log_path = os.path.join(args.data_path, "logs")
-        config.telemetry_db_path = os.path.join(args.data_path, "telemetry.db")
+        overrides['data_path'] = args.data_path
+        overrides['image_path'] = os.path.join(args.data_path, "images")
+        overrides['log_path'] = os.path.join(args.data_path, "logs")
+        overrides['telemetry_db_path'] = os.path.join(args.data_path, "telemetry.db")
     if args.simulate:
-        config.simulate_radio = True
+        overrides['simulate_radio'] = True
+    config = config.with_overrides(**overrides)
     
     # Setup logging
     log_level = getattr(logging, args.log_level.upper())
     setup_logging(config.log_path, log_level, "raptorhab-ground")
     
+    # Compile the tracking kernels now rather than on the first packet
+    warm_up_kernels()
+    
     # Create ground station
     station = GroundStation(config, simulate=args.simulate)
     
@@ -0,0 +1,144 @@
+"""
+RaptorHab Ground Station - MBTiles Writer
+Shared by the offline map downloaders
+
+Normalized MBTiles schema (map + images, exposed to readers as the
+standard tiles view, plus the ETags used for conditional re-downloads)
+and the SQLite settings and batched writes for a bulk import.
+"""
+
+import hashlib
+import sqlite3
+from typing import Dict, List, Optional, Set, Tuple
+
+from ground.tilemath import xyz_to_tms
+
+INSERT_BATCH_SIZE = 512  # Tiles staged per executemany() call
+
+
+def configure_bulk_load(conn: sqlite3.Connection):
+    """
+    Tune SQLite for a single-writer bulk import.
+    
+    page_size only takes effect on a new file, so it is set before any
+    other PRAGMA or table. Existing files keep their page size until they
+    are recreated.
+    """
+    # 16 KiB pages hold a typical 10-20 KB tile without overflow chains
+    conn.execute('PRAGMA page_size=16384')
+    conn.execute('PRAGMA mmap_size=268435456')
+    conn.execute('PRAGMA journal_mode=WAL')
+    conn.execute('PRAGMA synchronous=NORMAL')
+    conn.execute('PRAGMA temp_store=MEMORY')
+    conn.execute('PRAGMA cache_size=-65536')
+    conn.execute('PRAGMA locking_mode=EXCLUSIVE')
+    # With synchronous=NORMAL the only fsyncs left are at WAL checkpoints;
+    # checkpoint every ~40 MB of WAL instead of the default 1000 pages
+    conn.execute('PRAGMA wal_autocheckpoint=2500')
+
+
+def flush_tiles(cursor: sqlite3.Cursor,
+                pending: List[Tuple[int, int, int, bytes, Optional[str]]],
+                seen_images: Set[bytes]):
+    """
+    Write staged (z, x, tms_y, data, etag) rows.
+    
+    Identical tiles (open ocean, blank terrain) share one row in images,
+    keyed by a BLAKE2b hash of the tile bytes.
+    """
+    if not pending:
+        return
+    
+    new_images = []
+    map_rows = []
+    etag_rows = []
+    for z, x, tms_y, data, etag in pending:
+        tile_id = hashlib.blake2b(data, digest_size=16).digest()
+        if tile_id not in seen_images:
+            seen_images.add(tile_id)
+            new_images.append((tile_id, data))
+        map_rows.append((z, x, tms_y, tile_id))
+        if etag:
+            etag_rows.append((z, x, tms_y, etag))
+    
+    # Inserting in key order keeps B-tree writes on neighbouring pages; the
+    # image hashes are random, so unsorted they would touch a new leaf each
+    new_images.sort()
+    map_rows.sort()
+    etag_rows.sort()
+    
+    cursor.executemany('INSERT OR IGNORE INTO images (tile_id, tile_data) VALUES (?, ?)', new_images)
+    cursor.executemany(
+        'INSERT OR REPLACE INTO map (zoom_level, tile_column, tile_row, tile_id) VALUES (?, ?, ?, ?)',
+        map_rows
+    )
+    cursor.executemany(
+        'INSERT OR REPLACE INTO etags (zoom_level, tile_column, tile_row, etag) VALUES (?, ?, ?, ?)',
+        etag_rows
+    )
+    pending.clear()
+
+
+def finish_bulk_load(conn: sqlite3.Connection):
+    """Drop orphaned images and gather planner statistics once the download has finished"""
+    # Re-downloaded tiles that changed point map at a new images row; the
+    # old blob is no longer referenced by any tile
+    conn.execute('DELETE FROM images WHERE tile_id NOT IN (SELECT tile_id FROM map)')
+    conn.execute('ANALYZE')
+    conn.commit()
+
+
+def load_etags(conn: sqlite3.Connection) -> Dict[Tuple[int, int, int], str]:
+    """Stored ETags keyed by XYZ (z, x, y), used for conditional re-downloads"""
+    cursor = conn.execute('SELECT zoom_level, tile_column, tile_row, etag FROM etags')
+    return {(z, x, xyz_to_tms(z, tms_y)): etag for z, x, tms_y, etag in cursor}
+
+
+def create_tile_schema(cursor: sqlite3.Cursor):
+    """
+    Create the normalized MBTiles schema (map + images, exposed as a tiles view).
+    
+    Files written by older versions with a flat tiles table are converted
+    in place so they can still be resumed.
+    """
+    cursor.execute("SELECT type FROM sqlite_master WHERE name = 'tiles'")
+    row = cursor.fetchone()
+    legacy = row is not None and row[0] == 'table'
+    if legacy:
+        cursor.execute('ALTER TABLE tiles RENAME TO tiles_flat')
+    
+    # Keyed on the (z, x, y) columns themselves rather than a packed
+    # quadkey: MBTiles readers look tiles up by those columns through the
+    # tiles view, which could not use an index on a computed key. With
+    # WITHOUT ROWID the primary key is the table's only B-tree anyway.
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS map (
+            zoom_level INTEGER, tile_column INTEGER, tile_row INTEGER, tile_id BLOB,
+            PRIMARY KEY (zoom_level, tile_column, tile_row)
+        ) WITHOUT ROWID
+    ''')
+    cursor.execute('CREATE TABLE IF NOT EXISTS images (tile_id BLOB PRIMARY KEY, tile_data BLOB)')
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS etags (
+            zoom_level INTEGER, tile_column INTEGER, tile_row INTEGER, etag TEXT,
+            PRIMARY KEY (zoom_level, tile_column, tile_row)
+        ) WITHOUT ROWID
+    ''')
+    cursor.execute('''
+        CREATE VIEW IF NOT EXISTS tiles AS
+        SELECT map.zoom_level AS zoom_level, map.tile_column AS tile_column,
+               map.tile_row AS tile_row, images.tile_data AS tile_data
+        FROM map JOIN images ON images.tile_id = map.tile_id
+    ''')
+    
+    if legacy:
+        seen_images = set()
+        rows = cursor.connection.execute(
+            'SELECT zoom_level, tile_column, tile_row, tile_data, NULL FROM tiles_flat'
+        )
+        while True:
+            pending = rows.fetchmany(INSERT_BATCH_SIZE)
+            if not pending:
+                break
+            flush_tiles(cursor, pending, seen_images)
+        cursor.execute('DROP TABLE tiles_flat')
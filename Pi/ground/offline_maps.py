@@ -25,14 +25,63 @@ For smaller regional files, use tools like:
 import os
 import sqlite3
 import logging
-import gzip
 import io
-from typing import Optional, Dict, Tuple, List, Any
+import time
+import zlib
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Optional, Dict, Tuple, List, Any, Iterator
 from threading import Lock
 from pathlib import Path
 
+from ground.tilemath import tile_range
+
+# ISA-L's zlib-compatible decoder gunzips vector tiles several times faster
+try:
+    from isal import isal_zlib
+    ISAL_AVAILABLE = True
+except ImportError:
+    ISAL_AVAILABLE = False
+
+_gunzip = isal_zlib.decompress if ISAL_AVAILABLE else zlib.decompress
+_GUNZIP_ERRORS = (zlib.error, isal_zlib.error) if ISAL_AVAILABLE else (zlib.error,)
+_GZIP_WBITS = 31  # zlib wbits for a gzip header and trailer
+
 logger = logging.getLogger(__name__)
 
+# Decoded tiles kept in memory per MBTiles file; a browser map view
+# holds a few dozen tiles, panning/zooming around revisits them
+DEFAULT_TILE_CACHE_SIZE = 512
+
+# COUNT(*) walks the whole tiles index (seconds on a large planet file);
+# the status page reuses the last count for this long
+TILE_COUNT_TTL = 300.0
+
+# How long a zoom level's known column range is trusted before it is read
+# again (a download may still be adding tiles); immutable maps keep it
+TILE_RANGE_TTL = 300.0
+
+# Read-side connection tuning. mmap lets tile blobs be read straight out of
+# the page cache, and query_only guards the map files against stray writes.
+READ_PRAGMAS = '''
+    PRAGMA synchronous=NORMAL;
+    PRAGMA temp_store=MEMORY;
+    PRAGMA mmap_size=268435456;
+    PRAGMA cache_size=-65536;
+    PRAGMA query_only=1;
+'''
+
+# Hot-path queries. Kept as constants so every call hands SQLite the same
+# string and hits its prepared statement cache.
+_GET_TILE_SQL = "SELECT tile_data FROM tiles WHERE zoom_level=? AND tile_column=? AND tile_row=?"
+_HAS_TILE_SQL = "SELECT 1 FROM tiles WHERE zoom_level=? AND tile_column=? AND tile_row=? LIMIT 1"
+
+# MBTiles rows are TMS (y=0 at the bottom), Leaflet/OSM tiles are XYZ (y=0
+# at the top): tms_y = _TMS_MAX_Y[z] - y, and the same flips it back.
+# Zoom 30 is as deep as any tile scheme goes; deeper requests find nothing.
+_TMS_MAX_Y = tuple((1 << z) - 1 for z in range(31))
+
 
 class MBTilesReader:
     """
@@ -46,38 +95,142 @@ class MBTilesReader:
     from the XYZ/Slippy map convention used by Leaflet/OSM.
     """
     
-    def __init__(self, mbtiles_path: str):
+    def __init__(self, mbtiles_path: str, cache_size: int = DEFAULT_TILE_CACHE_SIZE,
+                 immutable: bool = False):
         """
         Initialize MBTiles reader
         
         Args:
             mbtiles_path: Path to .mbtiles file
+            cache_size: Number of decoded tiles to keep in memory (0 disables)
+            immutable: Promise SQLite the file never changes while open, which
+                drops all file locking. Only for finished maps - a file
+                still being downloaded into would read as corrupt or stale.
         """
         self.path = mbtiles_path
-        self._conn: Optional[sqlite3.Connection] = None
+        self._immutable = immutable
         self._lock = Lock()
         self._metadata: Dict[str, str] = {}
+        self._metadata_loaded = False  # Read on first use, see _ensure_metadata()
+        
+        # Parsed from the metadata by _ensure_metadata()
+        self._format = 'png'
+        self._content_type = 'image/png'
+        self._min_zoom = 0
+        self._max_zoom = 18
+        self._bounds: Optional[Tuple[float, float, float, float]] = None
+        
+        # Request pre-checks from the metadata, only where the file states
+        # them: (min, max) zoom, and per zoom the tile box covering bounds
+        self._zoom_limits: Optional[Tuple[int, int]] = None
+        self._bounds_tiles: Dict[int, Tuple[int, int, int, int]] = {}
         self._is_valid = False
         
+        # Pool of read connections, so concurrent tile requests each get
+        # their own instead of queueing on one. Each is pooled as a
+        # long-lived cursor on it. _idle is only touched with
+        # list.append/pop (atomic); _conns (every connection, for close())
+        # is guarded by self._lock.
+        self._idle: List[sqlite3.Cursor] = []
+        self._conns: List[sqlite3.Connection] = []
+        
+        # LRU of (z, x, y) -> decoded tile bytes, guarded by self._lock
+        self._tile_cache: 'OrderedDict[Tuple[int, int, int], bytes]' = OrderedDict()
+        self._cache_size = cache_size
+        
+        # Last COUNT(*) result and when it was taken (time.monotonic)
+        self._tile_count: Optional[int] = None
+        self._tile_count_time = 0.0
+        
+        # zoom -> (time.monotonic, (min, max) tile_column or None if the zoom
+        # is empty). Lets requests for columns with no tiles skip SQLite.
+        self._zoom_columns: Dict[int, Tuple[float, Optional[Tuple[int, int]]]] = {}
+        self._index_table = 'tiles'
+        
+        # Name, mtime and size of the file when opened; tags tiles for HTTP
+        # caching, so a replaced map file invalidates browser copies
+        self.version = ''
+        
         if os.path.exists(mbtiles_path):
+            st = os.stat(mbtiles_path)
+            self.version = f"{Path(mbtiles_path).stem}.{st.st_mtime_ns:x}.{st.st_size:x}"
             self._init_connection()
     
+    def _open_read_only(self) -> sqlite3.Connection:
+        """Open the file read-only (and immutable if set), falling back to a plain open"""
+        params = 'mode=ro&immutable=1' if self._immutable else 'mode=ro'
+        uri = f"{Path(self.path).resolve().as_uri()}?{params}"
+        # Pooled connections move between request threads
+        try:
+            return sqlite3.connect(uri, uri=True, check_same_thread=False)
+        except sqlite3.OperationalError as e:
+            logger.debug(f"Read-only open of {self.path} failed ({e}), opening normally")
+            return sqlite3.connect(self.path, check_same_thread=False)
+    
+    def _connect(self) -> sqlite3.Cursor:
+        """Open and tune a new read connection, returning a cursor on it"""
+        # Rows stay plain tuples: every query here reads by position,
+        # sqlite3.Row would just be an extra object per fetch.
+        conn = self._open_read_only()
+        conn.executescript(READ_PRAGMAS)
+        with self._lock:
+            self._conns.append(conn)
+        return conn.cursor()
+    
+    @contextmanager
+    def _cursor(self) -> Iterator[sqlite3.Cursor]:
+        """
+        Borrow a read cursor from the pool, opening a connection if none is idle
+        
+        Read results with fetchall() (or exhaust the cursor): a pooled cursor
+        left mid-result keeps its statement, and with it a read snapshot
+        of the database, open until the next query.
+        """
+        try:
+            cursor = self._idle.pop()
+        except IndexError:
+            cursor = self._connect()
+        try:
+            yield cursor
+        finally:
+            self._idle.append(cursor)
+    
     def _init_connection(self):
-        """Initialize database connection and load metadata"""
+        """Initialize database connection (metadata is loaded on first use)"""
         try:
-            self._conn = sqlite3.connect(self.path, check_same_thread=False)
-            self._conn.row_factory = sqlite3.Row
+            if self._immutable:
+                # No locking and no journal to switch
+                conn = self._open_read_only()
+                journal_mode = 'immutable'
+            else:
+                conn = sqlite3.connect(self.path, check_same_thread=False)
+                
+                # WAL lets readers run alongside a writer. Switching needs write
+                # access to the file and its directory, so carry on without it.
+                # Files made by download_maps.py are WAL already.
+                try:
+                    journal_mode = conn.execute("PRAGMA journal_mode=WAL").fetchone()[0]
+                except sqlite3.Error:
+                    journal_mode = conn.execute("PRAGMA journal_mode").fetchone()[0]
+            conn.executescript(READ_PRAGMAS)
+            with self._lock:
+                self._conns.append(conn)
+            self._idle.append(conn.cursor())
             
-            # Load metadata
-            cursor = self._conn.execute("SELECT name, value FROM metadata")
-            for row in cursor:
-                self._metadata[row['name']] = row['value']
+            # Check it really is an MBTiles file; this reads the schema,
+            # which the first tile query needs anyway
+            names = {name for (name,) in conn.execute(
+                "SELECT name FROM sqlite_master WHERE name IN ('tiles', 'map')"
+            )}
+            if 'tiles' not in names:
+                raise ValueError("no tiles table")
+            # In the normalized layout tiles is a view over map + images;
+            # the column range comes straight from map's primary key
+            if 'map' in names:
+                self._index_table = 'map'
             
             self._is_valid = True
-            logger.info(f"Loaded MBTiles: {self.path}")
-            logger.info(f"  Name: {self._metadata.get('name', 'Unknown')}")
-            logger.info(f"  Format: {self._metadata.get('format', 'Unknown')}")
-            logger.info(f"  Bounds: {self._metadata.get('bounds', 'Unknown')}")
+            logger.info(f"Loaded MBTiles: {self.path} (journal mode: {journal_mode})")
             
         except Exception as e:
             logger.error(f"Failed to open MBTiles {self.path}: {e}")
@@ -87,46 +240,146 @@ class MBTilesReader:
     def is_valid(self) -> bool:
         return self._is_valid
     
+    def _ensure_metadata(self) -> Dict[str, str]:
+        """Load the metadata table the first time it is needed"""
+        if self._metadata_loaded or not self._is_valid:
+            return self._metadata
+        
+        metadata = {}
+        try:
+            with self._cursor() as cursor:
+                cursor.execute("SELECT name, value FROM metadata")
+                metadata = dict(cursor.fetchall())
+        except Exception as e:
+            logger.warning(f"Failed to read MBTiles metadata {self.path}: {e}")
+        
+        # Two threads may both load it; they read the same rows
+        with self._lock:
+            if not self._metadata_loaded:
+                self._metadata = metadata
+                self._parse_metadata(metadata)
+                self._metadata_loaded = True
+                logger.info(f"MBTiles {self.path}: name={metadata.get('name', 'Unknown')}, "
+                            f"format={metadata.get('format', 'Unknown')}, "
+                            f"bounds={metadata.get('bounds', 'Unknown')}")
+        return self._metadata
+    
+    def _parse_metadata(self, metadata: Dict[str, str]):
+        """Convert the metadata values the properties hand out, once"""
+        self._format = metadata.get('format', 'png')
+        self._content_type = get_content_type(self._format)
+        try:
+            self._min_zoom = int(metadata.get('minzoom', 0))
+            self._max_zoom = int(metadata.get('maxzoom', 18))
+            if 'minzoom' in metadata and 'maxzoom' in metadata:
+                self._zoom_limits = (self._min_zoom, self._max_zoom)
+        except ValueError:
+            logger.warning(f"Bad zoom range in MBTiles metadata {self.path}")
+        
+        bounds_str = metadata.get('bounds')
+        if bounds_str:
+            try:
+                parts = [float(x) for x in bounds_str.split(',')]
+            except ValueError:
+                parts = []
+            if len(parts) == 4:
+                self._bounds = tuple(parts)
+    
     @property
     def metadata(self) -> Dict[str, str]:
-        return self._metadata.copy()
+        return self._ensure_metadata().copy()
     
     @property
     def format(self) -> str:
         """Get tile format (png, jpg, pbf, webp)"""
-        return self._metadata.get('format', 'png')
+        if not self._metadata_loaded:
+            self._ensure_metadata()
+        return self._format
+    
+    @property
+    def content_type(self) -> str:
+        """MIME type of the tiles, from the format"""
+        if not self._metadata_loaded:
+            self._ensure_metadata()
+        return self._content_type
     
     @property
     def min_zoom(self) -> int:
         """Get minimum zoom level"""
-        return int(self._metadata.get('minzoom', 0))
+        if not self._metadata_loaded:
+            self._ensure_metadata()
+        return self._min_zoom
     
     @property
     def max_zoom(self) -> int:
         """Get maximum zoom level"""
-        return int(self._metadata.get('maxzoom', 18))
+        if not self._metadata_loaded:
+            self._ensure_metadata()
+        return self._max_zoom
     
     @property
     def bounds(self) -> Optional[Tuple[float, float, float, float]]:
         """Get bounds as (west, south, east, north)"""
-        bounds_str = self._metadata.get('bounds')
-        if bounds_str:
-            parts = [float(x) for x in bounds_str.split(',')]
-            if len(parts) == 4:
-                return tuple(parts)
-        return None
+        if not self._metadata_loaded:
+            self._ensure_metadata()
+        return self._bounds
     
-    def _tms_to_xyz(self, z: int, y: int) -> int:
-        """
-        Convert TMS y-coordinate to XYZ/Slippy y-coordinate
-        MBTiles uses TMS where y=0 is at the bottom
-        Leaflet/OSM use XYZ where y=0 is at the top
-        """
-        return (1 << z) - 1 - y
+    def _column_range(self, z: int) -> Optional[Tuple[int, int]]:
+        """(min, max) tile_column present at zoom z, or None if it has no tiles"""
+        now = time.monotonic()
+        entry = self._zoom_columns.get(z)
+        if entry is not None and (self._immutable or now - entry[0] < TILE_RANGE_TTL):
+            return entry[1]
+        
+        # Two queries so each is a single index seek (SQLite only does the
+        # MIN/MAX shortcut for one aggregate per query)
+        table = self._index_table
+        try:
+            with self._cursor() as cursor:
+                cursor.execute(f"SELECT MIN(tile_column) FROM {table} WHERE zoom_level=?", (z,))
+                col_min = cursor.fetchall()[0][0]
+                cursor.execute(f"SELECT MAX(tile_column) FROM {table} WHERE zoom_level=?", (z,))
+                col_max = cursor.fetchall()[0][0]
+        except sqlite3.Error:
+            # Can't tell - don't rule anything out
+            return (0, _TMS_MAX_Y[z])
+        
+        columns = None if col_min is None else (col_min, col_max)
+        self._zoom_columns[z] = (now, columns)
+        return columns
+    
+    def _bounds_box(self, z: int) -> Optional[Tuple[int, int, int, int]]:
+        """XYZ (x_min, x_max, y_min, y_max) covering the metadata bounds at zoom z"""
+        box = self._bounds_tiles.get(z)
+        if box is None:
+            west, south, east, north = self._bounds
+            if west >= east or south >= north:
+                return None  # Crosses the antimeridian or malformed; no check
+            x_min, x_max, y_min, y_max = tile_range(west, south, east, north, z)
+            # One tile of slack for bounds rounded in the metadata
+            box = (x_min - 1, x_max + 1, y_min - 1, y_max + 1)
+            self._bounds_tiles[z] = box
+        return box
     
-    def _xyz_to_tms(self, z: int, y: int) -> int:
-        """Convert XYZ y-coordinate to TMS y-coordinate"""
-        return (1 << z) - 1 - y
+    def _may_have_tile(self, z: int, x: int, y: int) -> bool:
+        """Cheap pre-check: False only if (z, x, y) certainly has no tile"""
+        if z >= len(_TMS_MAX_Y):
+            return False
+        
+        # What the metadata promises: plain arithmetic, no query
+        if not self._metadata_loaded:
+            self._ensure_metadata()
+        if self._zoom_limits is not None and not (
+                self._zoom_limits[0] <= z <= self._zoom_limits[1]):
+            return False
+        if self._bounds is not None:
+            box = self._bounds_box(z)
+            if box is not None and not (box[0] <= x <= box[1] and box[2] <= y <= box[3]):
+                return False
+        
+        # What the file actually holds
+        columns = self._column_range(z)
+        return columns is not None and columns[0] <= x <= columns[1]
     
     def get_tile(self, z: int, x: int, y: int) -> Optional[bytes]:
         """
@@ -143,61 +396,98 @@ class MBTilesReader:
         if not self._is_valid:
             return None
         
-        # Convert XYZ y to TMS y
-        tms_y = self._xyz_to_tms(z, y)
+        key = (z, x, y)
         
         with self._lock:
+            data = self._tile_cache.get(key)
+            if data is not None:
+                self._tile_cache.move_to_end(key)
+                return data
+        
+        if not self._may_have_tile(z, x, y):
+            return None
+        
+        # Convert XYZ y to TMS y
+        tms_y = _TMS_MAX_Y[z] - y
+        
+        try:
+            with self._cursor() as cursor:
+                cursor.execute(_GET_TILE_SQL, (z, x, tms_y))
+                rows = cursor.fetchall()
+        except sqlite3.Error as e:
+            logger.debug(f"Tile fetch error z={z} x={x} y={y}: {e}")
+            return None
+        
+        if not rows or not rows[0][0]:
+            return None
+        data = rows[0][0]
+        
+        # Check if data is gzip compressed (common for vector tiles)
+        if len(data) >= 2 and data[0] == 0x1f and data[1] == 0x8b:
             try:
-                cursor = self._conn.execute(
-                    "SELECT tile_data FROM tiles WHERE zoom_level=? AND tile_column=? AND tile_row=?",
-                    (z, x, tms_y)
-                )
-                row = cursor.fetchone()
-                if row:
-                    data = row['tile_data']
-                    
-                    # Check if data is gzip compressed (common for vector tiles)
-                    if data[:2] == b'\x1f\x8b':
-                        try:
-                            data = gzip.decompress(data)
-                        except:
-                            pass  # Not actually gzipped or decompression failed
-                    
-                    return data
-                    
-            except Exception as e:
-                logger.debug(f"Tile fetch error z={z} x={x} y={y}: {e}")
+                data = _gunzip(data, _GZIP_WBITS)
+            except _GUNZIP_ERRORS:
+                pass  # Not actually gzipped or decompression failed
         
-        return None
+        if self._cache_size > 0:
+            with self._lock:
+                self._tile_cache[key] = data
+                if len(self._tile_cache) > self._cache_size:
+                    self._tile_cache.popitem(last=False)
+        
+        return data
     
     def has_tile(self, z: int, x: int, y: int) -> bool:
-        """Check if tile exists without fetching data"""
+        """
+        Check if tile exists without fetching data
+        
+        To serve a tile, call get_tile() and check for None instead of
+        pairing it with this: that is one query instead of two.
+        """
         if not self._is_valid:
             return False
         
-        tms_y = self._xyz_to_tms(z, y)
-        
+        # Anything in the tile cache exists without asking SQLite
         with self._lock:
-            try:
-                cursor = self._conn.execute(
-                    "SELECT 1 FROM tiles WHERE zoom_level=? AND tile_column=? AND tile_row=? LIMIT 1",
-                    (z, x, tms_y)
-                )
-                return cursor.fetchone() is not None
-            except:
-                return False
+            if (z, x, y) in self._tile_cache:
+                return True
+        
+        if not self._may_have_tile(z, x, y):
+            return False
+        
+        try:
+            with self._cursor() as cursor:
+                cursor.execute(_HAS_TILE_SQL, (z, x, _TMS_MAX_Y[z] - y))
+                return len(cursor.fetchall()) > 0
+        except sqlite3.Error:
+            return False
     
     def get_tile_count(self) -> int:
-        """Get total number of tiles in the database"""
+        """
+        Get total number of tiles in the database
+        
+        Uses a tile_count metadata entry when the file has one, otherwise
+        a COUNT(*) that is cached for TILE_COUNT_TTL seconds.
+        """
         if not self._is_valid:
             return 0
         
-        with self._lock:
-            try:
-                cursor = self._conn.execute("SELECT COUNT(*) FROM tiles")
-                return cursor.fetchone()[0]
-            except:
-                return 0
+        meta_count = self._ensure_metadata().get('tile_count')
+        if meta_count and meta_count.isdigit():
+            return int(meta_count)
+        
+        now = time.monotonic()
+        if self._tile_count is not None and now - self._tile_count_time < TILE_COUNT_TTL:
+            return self._tile_count
+        
+        try:
+            with self._cursor() as cursor:
+                cursor.execute("SELECT COUNT(*) FROM tiles")
+                self._tile_count = cursor.fetchall()[0][0]
+                self._tile_count_time = now
+                return self._tile_count
+        except sqlite3.Error:
+            return 0
     
     def get_zoom_stats(self) -> Dict[int, int]:
         """Get tile count per zoom level"""
@@ -205,24 +495,27 @@ class MBTilesReader:
             return {}
         
         stats = {}
-        with self._lock:
-            try:
-                cursor = self._conn.execute(
+        try:
+            with self._cursor() as cursor:
+                cursor.execute(
                     "SELECT zoom_level, COUNT(*) as count FROM tiles GROUP BY zoom_level ORDER BY zoom_level"
                 )
-                for row in cursor:
-                    stats[row['zoom_level']] = row['count']
-            except:
-                pass
+                for zoom_level, count in cursor:
+                    stats[zoom_level] = count
+        except sqlite3.Error:
+            pass
         
         return stats
     
     def close(self):
-        """Close database connection"""
-        if self._conn:
-            self._conn.close()
-            self._conn = None
-            self._is_valid = False
+        """Close all database connections"""
+        self._is_valid = False
+        with self._lock:
+            for conn in self._conns:
+                conn.close()
+            self._conns.clear()
+            self._idle.clear()
+            self._tile_cache.clear()
 
 
 class OfflineMapManager:
@@ -231,14 +524,19 @@ class OfflineMapManager:
     Supports fallback between different map sources
     """
     
-    def __init__(self, maps_dir: str):
+    def __init__(self, maps_dir: str, tile_cache_size: int = DEFAULT_TILE_CACHE_SIZE,
+                 immutable: bool = False):
         """
         Initialize offline map manager
         
         Args:
             maps_dir: Directory containing .mbtiles files
+            tile_cache_size: Decoded tiles kept in memory per map file
+            immutable: Open the map files as immutable (see MBTilesReader)
         """
         self.maps_dir = maps_dir
+        self.tile_cache_size = tile_cache_size
+        self.immutable = immutable
         self._readers: Dict[str, MBTilesReader] = {}
         self._default_reader: Optional[MBTilesReader] = None
         self._lock = Lock()
@@ -254,15 +552,29 @@ class OfflineMapManager:
         if not os.path.exists(self.maps_dir):
             return
         
-        for filename in os.listdir(self.maps_dir):
-            if filename.endswith('.mbtiles'):
-                filepath = os.path.join(self.maps_dir, filename)
-                name = filename[:-8]  # Remove .mbtiles extension
-                
-                reader = MBTilesReader(filepath)
-                if reader.is_valid:
+        files = []
+        with os.scandir(self.maps_dir) as entries:
+            for entry in entries:
+                if entry.name.endswith('.mbtiles') and entry.is_file():
+                    name = entry.name[:-8]  # Remove .mbtiles extension
+                    files.append((name, entry.path))
+        
+        if not files:
+            return
+        
+        # Opening a map is mostly waiting on the disk (SQLite open plus the
+        # metadata read), so open them side by side
+        with ThreadPoolExecutor(max_workers=min(8, len(files)),
+                                thread_name_prefix='mbtiles-open') as executor:
+            readers = list(executor.map(
+                lambda f: MBTilesReader(f[1], self.tile_cache_size, self.immutable), files
+            ))
+        
+        for (name, _), reader in zip(files, readers):
+            if reader.is_valid:
+                with self._lock:
                     self._readers[name] = reader
-                    logger.info(f"Loaded offline map: {name}")
+                logger.info(f"Loaded offline map: {name}")
     
     def set_default(self, name: str) -> bool:
         """Set the default map source"""
@@ -278,7 +590,7 @@ class OfflineMapManager:
         filepath = os.path.join(self.maps_dir, name)
         if os.path.exists(filepath):
             map_name = name[:-8]
-            reader = MBTilesReader(filepath)
+            reader = MBTilesReader(filepath, self.tile_cache_size, self.immutable)
             if reader.is_valid:
                 self._readers[map_name] = reader
                 self._default_reader = reader
@@ -298,6 +610,27 @@ class OfflineMapManager:
         """Check if any offline maps are available"""
         return len(self._readers) > 0
     
+    def _pick_reader(self, map_name: Optional[str]) -> Optional[MBTilesReader]:
+        """Reader serving map_name, else the default, else the first available"""
+        if map_name and map_name in self._readers:
+            return self._readers[map_name]
+        if self._default_reader:
+            return self._default_reader
+        if self._readers:
+            return next(iter(self._readers.values()))
+        return None
+    
+    def tile_etag(self, z: int, x: int, y: int, map_name: Optional[str] = None) -> Optional[str]:
+        """
+        HTTP entity tag for a tile, without reading it
+        
+        Lets a conditional request be answered with 304 before touching SQLite.
+        """
+        reader = self._pick_reader(map_name)
+        if reader and reader.version:
+            return f"{reader.version}.{z}.{x}.{y}"
+        return None
+    
     def get_tile(self, z: int, x: int, y: int, map_name: Optional[str] = None) -> Optional[Tuple[bytes, str]]:
         """
         Get tile from offline maps
@@ -309,22 +642,13 @@ class OfflineMapManager:
             map_name: Specific map to use (None for default)
             
         Returns:
-            Tuple of (tile_data, format) or None if not found
+            Tuple of (tile_data, content_type) or None if not found
         """
-        reader = None
-        
-        if map_name and map_name in self._readers:
-            reader = self._readers[map_name]
-        elif self._default_reader:
-            reader = self._default_reader
-        elif self._readers:
-            # Use first available
-            reader = next(iter(self._readers.values()))
-        
+        reader = self._pick_reader(map_name)
         if reader:
             data = reader.get_tile(z, x, y)
             if data:
-                return (data, reader.format)
+                return (data, reader.content_type)
         
         return None
     
@@ -357,14 +681,19 @@ class OfflineMapManager:
         self._default_reader = None
 
 
+# MIME type per MBTiles format (keys lowercase)
+TILE_CONTENT_TYPES = {
+    'png': 'image/png',
+    'jpg': 'image/jpeg',
+    'jpeg': 'image/jpeg',
+    'webp': 'image/webp',
+    'pbf': 'application/x-protobuf',
+    'mvt': 'application/vnd.mapbox-vector-tile',
+}
+_content_type_get = TILE_CONTENT_TYPES.get
+
+
 def get_content_type(format: str) -> str:
     """Get MIME content type for tile format"""
-    formats = {
-        'png': 'image/png',
-        'jpg': 'image/jpeg',
-        'jpeg': 'image/jpeg',
-        'webp': 'image/webp',
-        'pbf': 'application/x-protobuf',
-        'mvt': 'application/vnd.mapbox-vector-tile',
-    }
-    return formats.get(format.lower(), 'application/octet-stream')
+    return _content_type_get(format if format.islower() else format.lower(),
+                             'application/octet-stream')
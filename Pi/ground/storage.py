@@ -11,7 +11,7 @@ import sqlite3
 import hashlib
 from dataclasses import dataclass, asdict
 from datetime import datetime
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, Iterator, List, Optional, Tuple
 from threading import Lock
 from pathlib import Path
 
@@ -20,6 +20,26 @@ from ground.decoder import ImageMetadata
 logger = logging.getLogger(__name__)
 
 
+class _ChunkSink:
+    """Write-only, unseekable file object that collects bytes for a generator"""
+    
+    def __init__(self):
+        self._chunks: List[bytes] = []
+    
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+    
+    def flush(self):
+        pass
+    
+    def drain(self) -> bytes:
+        """Return and forget everything written so far"""
+        data = b''.join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
 @dataclass
 class Session:
     """Information about a mission/session"""
@@ -801,6 +821,35 @@ class ImageStorage:
             logger.error(f"Failed to export session {session_id}: {e}")
             return None
     
+    def iter_session_zip(self, session_id: str) -> Optional[Iterator[bytes]]:
+        """
+        Stream a session as a ZIP archive, one chunk per image
+        
+        Images are stored uncompressed (they are already WebP/JPEG), so the
+        archive is never built on disk. Returns None if the session has no images.
+        """
+        images = self.get_session_images(session_id, count=10000)
+        if not images:
+            return None
+        return self._zip_chunks(session_id, images)
+    
+    def _zip_chunks(self, session_id: str, images: List[StoredImage]) -> Iterator[bytes]:
+        """Generator behind iter_session_zip"""
+        import zipfile
+        
+        sink = _ChunkSink()
+        with zipfile.ZipFile(sink, 'w', zipfile.ZIP_STORED) as zf:
+            for img in images:
+                try:
+                    # Add image with just filename (no path)
+                    zf.write(img.filepath, img.filename)
+                except OSError as e:
+                    logger.warning(f"Skipping {img.filepath} in session {session_id} ZIP: {e}")
+                    continue
+                yield sink.drain()
+        yield sink.drain()
+        logger.info(f"Streamed session {session_id} as ZIP ({len(images)} images)")
+    
     def close(self):
         """Close database connection"""
         if self._conn:
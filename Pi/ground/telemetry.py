@@ -6,23 +6,98 @@ Processes, stores, and provides access to received telemetry
 import logging
 import time
 import sqlite3
-import json
 import os
-from dataclasses import dataclass, asdict
-from datetime import datetime
-from typing import Dict, List, Optional, Callable, Any
-from threading import Lock
+from pathlib import Path
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Callable, Any, Iterator, Tuple
+from threading import Lock, RLock, Event, Thread
 from collections import deque
+from contextlib import contextmanager
+from itertools import islice
+from operator import attrgetter
 
-from common.constants import FixType
 from common.protocol import TelemetryPayload
 
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
+# Applied once per connection. WAL lets dashboard reads run alongside the
+# per-packet writer, and synchronous=NORMAL drops the fsync per commit
+# (WAL stays consistent; only the last commits can be lost on power cut).
+# page_size only takes effect on a new file, so it comes first; existing
+# databases keep theirs.
+DB_PRAGMAS = '''
+    PRAGMA page_size=8192;
+    PRAGMA journal_mode=WAL;
+    PRAGMA synchronous=NORMAL;
+    PRAGMA temp_store=MEMORY;
+    PRAGMA cache_size=-20000;
+    PRAGMA mmap_size=268435456;
+'''
+
+# Reader connections can't change the journal mode; the writer sets WAL
+READ_PRAGMAS = '''
+    PRAGMA temp_store=MEMORY;
+    PRAGMA cache_size=-20000;
+    PRAGMA mmap_size=268435456;
+    PRAGMA query_only=1;
+'''
+
+# Queued points are written in one transaction every FLUSH_INTERVAL_SEC,
+# or sooner once FLUSH_BATCH_SIZE are waiting
+FLUSH_INTERVAL_SEC = 0.5
+FLUSH_BATCH_SIZE = 50
+
+# get_stats() results are reused for this long unless new rows are written
+STATS_TTL_SEC = 0.5
+
+_INSERT_SQL = '''
+    INSERT INTO telemetry (
+        received_at, rssi, packet_seq,
+        latitude, longitude, altitude,
+        speed, heading, satellites, fix_type, gps_time,
+        battery_mv, cpu_temp, radio_temp,
+        image_id, image_progress, payload_rssi, session_id
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+'''
+
+# TelemetryPoint fields in declaration order, which is also the
+# _INSERT_SQL column order (session_id is appended)
+POINT_FIELDS = (
+    'received_at', 'rssi', 'packet_seq',
+    'latitude', 'longitude', 'altitude',
+    'speed', 'heading', 'satellites', 'fix_type', 'gps_time',
+    'battery_mv', 'cpu_temp', 'radio_temp',
+    'image_id', 'image_progress', 'payload_rssi',
+)
+_insert_fields = attrgetter(*POINT_FIELDS)
+_POINT_COLUMNS = ', '.join(POINT_FIELDS)
+
+# TelemetryPayload attributes in TelemetryPoint field order after packet_seq
+_payload_fields = attrgetter(
+    'latitude', 'longitude', 'altitude',
+    'speed', 'heading', 'satellites', 'fix_type', 'gps_time',
+    'battery_mv', 'cpu_temp', 'radio_temp',
+    'image_id', 'image_progress', 'rssi',
+)
 
-@dataclass
+
+@dataclass(frozen=True)
 class TelemetryPoint:
-    """A single telemetry data point"""
+    """
+    A single telemetry data point
+    
+    Immutable, so one instance can be shared by the buffer, the database
+    queue and the web emit thread. Declared __slots__ (no field defaults, so
+    this works before Python 3.10's slots=True) drop the per-instance dict.
+    """
+    __slots__ = POINT_FIELDS
+    
     # Reception info
     received_at: float
     rssi: int
@@ -50,7 +125,16 @@ class TelemetryPoint:
     
     def to_dict(self) -> Dict:
         """Convert to dictionary"""
-        return asdict(self)
+        # Flat primitive fields: no need for asdict()'s recursive deep copy
+        return dict(zip(POINT_FIELDS, _insert_fields(self)))
+    
+    # Frozen + __slots__ needs explicit state for pickle/copy
+    def __getstate__(self) -> tuple:
+        return _insert_fields(self)
+    
+    def __setstate__(self, state: tuple):
+        for name, value in zip(POINT_FIELDS, state):
+            object.__setattr__(self, name, value)
     
     @classmethod
     def from_payload(
@@ -61,25 +145,8 @@ class TelemetryPoint:
         packet_seq: int
     ) -> 'TelemetryPoint':
         """Create from TelemetryPayload"""
-        return cls(
-            received_at=received_at,
-            rssi=rssi,
-            packet_seq=packet_seq,
-            latitude=payload.latitude,
-            longitude=payload.longitude,
-            altitude=payload.altitude,
-            speed=payload.speed,
-            heading=payload.heading,
-            satellites=payload.satellites,
-            fix_type=payload.fix_type,
-            gps_time=payload.gps_time,
-            battery_mv=payload.battery_mv,
-            cpu_temp=payload.cpu_temp,
-            radio_temp=payload.radio_temp,
-            image_id=payload.image_id,
-            image_progress=payload.image_progress,
-            payload_rssi=payload.rssi,
-        )
+        # Positional: relies on _payload_fields matching the field order
+        return cls(received_at, rssi, packet_seq, *_payload_fields(payload))
 
 
 class TelemetryBuffer:
@@ -103,9 +170,16 @@ class TelemetryBuffer:
     def get_latest(self, count: int = 1) -> List[TelemetryPoint]:
         """Get the most recent points"""
         with self._lock:
-            if count >= len(self._buffer):
+            if count <= 0 or count >= len(self._buffer):
                 return list(self._buffer)
-            return list(self._buffer)[-count:]
+            # Walk in from the tail so only count points are touched
+            latest = list(islice(reversed(self._buffer), count))
+        latest.reverse()
+        return latest
+    
+    def get_latest_dicts(self, count: int = 1) -> List[Dict]:
+        """get_latest() as to_dict() dicts"""
+        return [p.to_dict() for p in self.get_latest(count)]
     
     def get_all(self) -> List[TelemetryPoint]:
         """Get all buffered points"""
@@ -114,8 +188,18 @@ class TelemetryBuffer:
     
     def get_since(self, timestamp: float) -> List[TelemetryPoint]:
         """Get points since a timestamp"""
+        # Copy under the lock (C speed) and filter outside it, so add() never
+        # waits on the Python loop. Points are appended in arrival order, so
+        # stop at the first older one.
         with self._lock:
-            return [p for p in self._buffer if p.received_at >= timestamp]
+            snapshot = self._buffer.copy()
+        since = []
+        for p in reversed(snapshot):
+            if p.received_at < timestamp:
+                break
+            since.append(p)
+        since.reverse()
+        return since
     
     def clear(self):
         """Clear the buffer"""
@@ -127,8 +211,112 @@ class TelemetryBuffer:
             return len(self._buffer)
 
 
+if NUMPY_AVAILABLE:
+    # One record per point, fields in TelemetryPoint order
+    TELEMETRY_DTYPE = np.dtype([
+        ('received_at', 'f8'), ('rssi', 'i4'), ('packet_seq', 'i4'),
+        ('latitude', 'f8'), ('longitude', 'f8'), ('altitude', 'f8'),
+        ('speed', 'f8'), ('heading', 'f8'), ('satellites', 'i4'),
+        ('fix_type', 'i4'), ('gps_time', 'i8'),
+        ('battery_mv', 'i4'), ('cpu_temp', 'f8'), ('radio_temp', 'f8'),
+        ('image_id', 'i4'), ('image_progress', 'i4'), ('payload_rssi', 'i4'),
+    ])
+
+
+class TelemetryArrayBuffer:
+    """
+    TelemetryBuffer stored as a preallocated NumPy record ring
+    
+    Same interface as TelemetryBuffer, at about 100 bytes per point instead
+    of a dataclass each. TelemetryPoints are only built for the points a
+    caller asks for; get_array() hands out the columns for vectorized use.
+    """
+    
+    def __init__(self, max_size: int = 1000):
+        """
+        Initialize buffer
+        
+        Args:
+            max_size: Maximum number of points to keep
+        """
+        self._arr = np.zeros(max_size, dtype=TELEMETRY_DTYPE)
+        self._head = 0  # next slot to write
+        self._size = 0
+        self._lock = Lock()
+    
+    def add(self, point: TelemetryPoint):
+        """Add a telemetry point"""
+        row = _insert_fields(point)
+        with self._lock:
+            self._arr[self._head] = row
+            self._head = (self._head + 1) % len(self._arr)
+            if self._size < len(self._arr):
+                self._size += 1
+    
+    def _tail(self, count: int) -> 'np.ndarray':
+        """Copy of the newest count records, oldest first (call under lock)"""
+        start = self._head - count
+        if start >= 0:
+            return self._arr[start:self._head].copy()
+        return np.concatenate((self._arr[start:], self._arr[:self._head]))
+    
+    def get_array(self, since: Optional[float] = None) -> 'np.ndarray':
+        """Buffered points as a record array, oldest first"""
+        with self._lock:
+            arr = self._tail(self._size)
+        if since is not None:
+            arr = arr[arr['received_at'] >= since]
+        return arr
+    
+    @staticmethod
+    def _to_points(arr: 'np.ndarray') -> List[TelemetryPoint]:
+        """Build TelemetryPoints from records"""
+        return [TelemetryPoint(*row) for row in arr.tolist()]
+    
+    def get_latest(self, count: int = 1) -> List[TelemetryPoint]:
+        """Get the most recent points"""
+        with self._lock:
+            if count <= 0 or count > self._size:
+                count = self._size
+            arr = self._tail(count)
+        return self._to_points(arr)
+    
+    def get_latest_dicts(self, count: int = 1) -> List[Dict]:
+        """get_latest() as to_dict() dicts, built straight from the records"""
+        with self._lock:
+            if count <= 0 or count > self._size:
+                count = self._size
+            arr = self._tail(count)
+        return [dict(zip(POINT_FIELDS, row)) for row in arr.tolist()]
+    
+    def get_all(self) -> List[TelemetryPoint]:
+        """Get all buffered points"""
+        return self._to_points(self.get_array())
+    
+    def get_since(self, timestamp: float) -> List[TelemetryPoint]:
+        """Get points since a timestamp"""
+        return self._to_points(self.get_array(since=timestamp))
+    
+    def clear(self):
+        """Clear the buffer"""
+        with self._lock:
+            self._head = 0
+            self._size = 0
+    
+    def __len__(self) -> int:
+        with self._lock:
+            return self._size
+
+
 class TelemetryDatabase:
-    """SQLite database for persistent telemetry storage"""
+    """
+    SQLite database for persistent telemetry storage
+    
+    insert() only queues the point; a background thread commits the queue
+    in batches so packet handling never waits on the SD card. Writes go
+    through one connection under self._lock; reads borrow pooled read-only
+    connections, which WAL lets run alongside the writer.
+    """
     
     def __init__(self, db_path: str, session_id: str = None):
         """
@@ -143,13 +331,31 @@ class TelemetryDatabase:
         self._conn: Optional[sqlite3.Connection] = None
         self._lock = Lock()
         
-        self._init_db()
+        # Idle read connections (list.append/pop are atomic) and every
+        # read connection ever opened, for close(), guarded by _readers_lock
+        self._idle_readers: List[sqlite3.Connection] = []
+        self._readers: List[sqlite3.Connection] = []
+        self._readers_lock = Lock()
+        
+        # Rows waiting for the flush thread; _flush_lock makes draining and
+        # writing them one step, taken before _lock when both are needed
+        self._pending: deque = deque()
+        self._flush_lock = RLock()
+        self._flush_event = Event()
+        self._closing = False
+        
+        # (time.monotonic, result) of the last get_stats(); writes reset it
+        self._stats_cache: Optional[Tuple[float, Dict]] = None
+        
+        # The file and schema are created by the first _get_conn() call,
+        # so an instance that is never used costs no disk I/O
+        
+        self._flush_thread = Thread(target=self._flush_worker, name="telemetry-flush", daemon=True)
+        self._flush_thread.start()
     
-    def _init_db(self):
+    def _init_db(self, conn: sqlite3.Connection):
         """Initialize database schema"""
-        os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
-        
-        with self._get_conn() as conn:
+        with conn:
             conn.execute('''
                 CREATE TABLE IF NOT EXISTS telemetry (
                     id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -191,10 +397,19 @@ class TelemetryDatabase:
                 ON telemetry(gps_time)
             ''')
             
-            conn.execute('''
-                CREATE INDEX IF NOT EXISTS idx_telemetry_session
-                ON telemetry(session_id)
-            ''')
+            # Session-scoped queries filter on session_id and order by time;
+            # the composite index serves both and supersedes the session-only one
+            has_session_time = conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE type='index' AND name='idx_telemetry_session_time'"
+            ).fetchone()
+            if not has_session_time:
+                conn.execute('''
+                    CREATE INDEX idx_telemetry_session_time
+                    ON telemetry(session_id, received_at)
+                ''')
+                conn.execute("DROP INDEX IF EXISTS idx_telemetry_session")
+                conn.execute("ANALYZE telemetry")
+                logger.info("Added session/time index to telemetry table")
             
             # Flight sessions table
             conn.execute('''
@@ -212,37 +427,122 @@ class TelemetryDatabase:
         logger.info(f"Telemetry database initialized: {self.db_path}")
     
     def _get_conn(self) -> sqlite3.Connection:
-        """Get database connection"""
+        """Get the writer connection, opening it and creating the schema on first use"""
         if self._conn is None:
-            self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
-            self._conn.row_factory = sqlite3.Row
+            os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+            conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            conn.row_factory = sqlite3.Row
+            try:
+                conn.executescript(DB_PRAGMAS)
+            except sqlite3.Error as e:
+                # Read-only media or an old SQLite: the defaults still work
+                logger.warning(f"Could not apply telemetry database pragmas: {e}")
+            self._init_db(conn)
+            self._conn = conn
         return self._conn
     
-    def insert(self, point: TelemetryPoint, session_id: str = None) -> int:
-        """Insert a telemetry point"""
+    def _open_reader(self) -> sqlite3.Connection:
+        """Open a read-only connection, falling back to a plain open"""
+        # Readers need the file and schema the writer creates
+        if self._conn is None:
+            with self._lock:
+                self._get_conn()
+        
+        uri = f"{Path(self.db_path).resolve().as_uri()}?mode=ro"
+        # Pooled connections move between request threads
+        try:
+            conn = sqlite3.connect(uri, uri=True, check_same_thread=False)
+        except sqlite3.OperationalError as e:
+            logger.debug(f"Read-only open of {self.db_path} failed ({e}), opening normally")
+            conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        try:
+            conn.executescript(READ_PRAGMAS)
+        except sqlite3.Error as e:
+            logger.warning(f"Could not apply telemetry reader pragmas: {e}")
+        with self._readers_lock:
+            self._readers.append(conn)
+        return conn
+    
+    @contextmanager
+    def _reader(self) -> Iterator[sqlite3.Connection]:
+        """Borrow a read connection from the pool, opening one if none is idle"""
+        try:
+            conn = self._idle_readers.pop()
+        except IndexError:
+            conn = self._open_reader()
+        try:
+            yield conn
+        finally:
+            self._idle_readers.append(conn)
+    
+    @staticmethod
+    def _point_row(point: TelemetryPoint, sid: Optional[str]) -> tuple:
+        """Parameters for _INSERT_SQL"""
+        return _insert_fields(point) + (sid,)
+    
+    def insert(self, point: TelemetryPoint, session_id: str = None):
+        """Queue a telemetry point for the next batch commit"""
+        sid = session_id or self.session_id
+        self._pending.append(self._point_row(point, sid))
+        if len(self._pending) >= FLUSH_BATCH_SIZE:
+            self._flush_event.set()
+    
+    def insert_sync(self, point: TelemetryPoint, session_id: str = None) -> int:
+        """Insert a telemetry point and commit immediately"""
         sid = session_id or self.session_id
         with self._lock:
             with self._get_conn() as conn:
-                cursor = conn.execute('''
-                    INSERT INTO telemetry (
-                        received_at, rssi, packet_seq,
-                        latitude, longitude, altitude,
-                        speed, heading, satellites, fix_type, gps_time,
-                        battery_mv, cpu_temp, radio_temp,
-                        image_id, image_progress, payload_rssi, session_id
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                ''', (
-                    point.received_at, point.rssi, point.packet_seq,
-                    point.latitude, point.longitude, point.altitude,
-                    point.speed, point.heading, point.satellites,
-                    point.fix_type, point.gps_time,
-                    point.battery_mv, point.cpu_temp, point.radio_temp,
-                    point.image_id, point.image_progress, point.payload_rssi,
-                    sid
-                ))
+                cursor = conn.execute(_INSERT_SQL, self._point_row(point, sid))
                 conn.commit()
+                self._stats_cache = None
                 return cursor.lastrowid
     
+    def insert_many(self, points: List[TelemetryPoint], session_id: str = None) -> int:
+        """Insert telemetry points in a single transaction, returning the count"""
+        sid = session_id or self.session_id
+        return self._write_rows([self._point_row(p, sid) for p in points])
+    
+    def _write_rows(self, rows: List[tuple]) -> int:
+        """Write insert parameter rows with one BEGIN...COMMIT"""
+        if not rows:
+            return 0
+        
+        with self._lock:
+            conn = self._get_conn()
+            if not conn.in_transaction:
+                conn.execute("BEGIN")
+            try:
+                conn.executemany(_INSERT_SQL, rows)
+                conn.commit()
+            except sqlite3.Error:
+                conn.rollback()
+                raise
+            self._stats_cache = None
+        return len(rows)
+    
+    def flush(self):
+        """Commit all queued points in one transaction"""
+        # deque.popleft is atomic, so insert() can keep appending meanwhile
+        with self._flush_lock:
+            rows = []
+            while True:
+                try:
+                    rows.append(self._pending.popleft())
+                except IndexError:
+                    break
+            try:
+                self._write_rows(rows)
+            except (sqlite3.Error, OSError) as e:
+                logger.error(f"Failed to store {len(rows)} telemetry points: {e}")
+    
+    def _flush_worker(self):
+        """Background thread committing queued points"""
+        while not self._closing:
+            self._flush_event.wait(FLUSH_INTERVAL_SEC)
+            self._flush_event.clear()
+            self.flush()
+    
     def query(
         self,
         start_time: Optional[float] = None,
@@ -250,32 +550,67 @@ class TelemetryDatabase:
         limit: int = 1000
     ) -> List[TelemetryPoint]:
         """Query telemetry points"""
-        with self._lock:
-            query = "SELECT * FROM telemetry WHERE 1=1"
-            params = []
-            
-            if start_time is not None:
-                query += " AND received_at >= ?"
-                params.append(start_time)
-            
-            if end_time is not None:
-                query += " AND received_at <= ?"
-                params.append(end_time)
-            
-            query += " ORDER BY received_at DESC LIMIT ?"
-            params.append(limit)
-            
-            with self._get_conn() as conn:
-                rows = conn.execute(query, params).fetchall()
-            
-            return [self._row_to_point(row) for row in rows]
+        query = f"SELECT {_POINT_COLUMNS} FROM telemetry WHERE 1=1"
+        params = []
+        
+        if start_time is not None:
+            query += " AND received_at >= ?"
+            params.append(start_time)
+        
+        if end_time is not None:
+            query += " AND received_at <= ?"
+            params.append(end_time)
+        
+        query += " ORDER BY received_at DESC LIMIT ?"
+        params.append(limit)
+        
+        with self._reader() as conn:
+            rows = conn.execute(query, params).fetchall()
+        
+        return [self._row_to_point(row) for row in rows]
+    
+    def iter_rows(
+        self,
+        columns: List[str],
+        start_time: Optional[float] = None,
+        batch_size: int = 1000
+    ) -> Iterator[tuple]:
+        """
+        Stream telemetry rows oldest first without building them all in memory
+        
+        Args:
+            columns: telemetry column names to select, in output order
+            start_time: Start of time range
+            batch_size: Rows fetched per cursor round trip
+        """
+        self.flush()
+        
+        query = f"SELECT {', '.join(columns)} FROM telemetry"
+        params = []
+        if start_time is not None:
+            query += " WHERE received_at >= ?"
+            params.append(start_time)
+        query += " ORDER BY received_at ASC"
+        
+        with self._reader() as conn:
+            cursor = conn.execute(query, params)
+            try:
+                while True:
+                    rows = cursor.fetchmany(batch_size)
+                    if not rows:
+                        break
+                    for row in rows:
+                        yield tuple(row)
+            finally:
+                cursor.close()
     
     def get_track(
         self,
         start_time: Optional[float] = None,
         end_time: Optional[float] = None,
         min_interval_sec: float = 1.0,
-        session_id: str = None
+        session_id: str = None,
+        max_points: Optional[int] = None
     ) -> List[Dict]:
         """
         Get GPS track for mapping
@@ -285,54 +620,57 @@ class TelemetryDatabase:
             end_time: End of time range
             min_interval_sec: Minimum interval between points (for thinning)
             session_id: Filter by session (None = all, 'current' = current session)
+            max_points: Widen the interval so roughly this many points come back
         
         Returns:
             List of {lat, lon, alt, time} dicts
         """
-        with self._lock:
-            query = """
-                SELECT latitude, longitude, altitude, gps_time, received_at
-                FROM telemetry
-                WHERE latitude != 0 AND longitude != 0
-            """
-            params = []
-            
-            # Session filter
-            if session_id == 'current' and self.session_id:
-                query += " AND session_id = ?"
-                params.append(self.session_id)
-            elif session_id and session_id != 'all':
-                query += " AND session_id = ?"
-                params.append(session_id)
-            
-            if start_time is not None:
-                query += " AND received_at >= ?"
-                params.append(start_time)
-            
-            if end_time is not None:
-                query += " AND received_at <= ?"
-                params.append(end_time)
-            
-            query += " ORDER BY received_at ASC"
-            
-            with self._get_conn() as conn:
-                rows = conn.execute(query, params).fetchall()
+        where = " WHERE latitude != 0 AND longitude != 0"
+        params = []
+        
+        # Session filter
+        if session_id == 'current' and self.session_id:
+            where += " AND session_id = ?"
+            params.append(self.session_id)
+        elif session_id and session_id != 'all':
+            where += " AND session_id = ?"
+            params.append(session_id)
+        
+        if start_time is not None:
+            where += " AND received_at >= ?"
+            params.append(start_time)
+        
+        if end_time is not None:
+            where += " AND received_at <= ?"
+            params.append(end_time)
+        
+        with self._reader() as conn:
+            # Size the buckets from the time span (an index range scan)
+            if max_points and max_points > 0:
+                first, last = conn.execute(
+                    "SELECT MIN(received_at), MAX(received_at) FROM telemetry" + where,
+                    params
+                ).fetchone()
+                if first is not None and last > first:
+                    min_interval_sec = max(min_interval_sec, (last - first) / max_points)
             
-            # Thin the track if needed
-            track = []
-            last_time = 0
+            # Thin in SQL: keep the first point of each min_interval_sec bucket.
+            # With a lone MIN() SQLite takes the bare columns from that row.
+            query = "SELECT latitude, longitude, altitude, gps_time, MIN(received_at) FROM telemetry" + where
+            if min_interval_sec > 0:
+                query += " GROUP BY CAST(received_at / ? AS INTEGER)"
+                params.append(min_interval_sec)
+            else:
+                query += " GROUP BY id"
             
-            for row in rows:
-                if row['received_at'] - last_time >= min_interval_sec:
-                    track.append({
-                        'lat': row['latitude'],
-                        'lon': row['longitude'],
-                        'alt': row['altitude'],
-                        'time': row['gps_time'],
-                    })
-                    last_time = row['received_at']
+            query += " ORDER BY MIN(received_at) ASC"
             
-            return track
+            rows = conn.execute(query, params).fetchall()
+        
+        return [
+            {'lat': row[0], 'lon': row[1], 'alt': row[2], 'time': row[3]}
+            for row in rows
+        ]
     
     def clear_track(self, session_id: str = None) -> int:
         """
@@ -348,96 +686,90 @@ class TelemetryDatabase:
         if not sid:
             return 0
         
-        with self._lock:
-            with self._get_conn() as conn:
-                cursor = conn.execute(
-                    "DELETE FROM telemetry WHERE session_id = ?",
-                    (sid,)
-                )
-                conn.commit()
-                return cursor.rowcount
+        # Queued points must not reappear after the delete, so no other
+        # flush may write between this one and the DELETE
+        with self._flush_lock:
+            self.flush()
+            
+            with self._lock:
+                with self._get_conn() as conn:
+                    cursor = conn.execute(
+                        "DELETE FROM telemetry WHERE session_id = ?",
+                        (sid,)
+                    )
+                    conn.commit()
+                    self._stats_cache = None
+                    return cursor.rowcount
     
     def get_sessions(self) -> List[Dict]:
         """Get list of all sessions with telemetry data"""
-        with self._lock:
-            with self._get_conn() as conn:
-                rows = conn.execute('''
-                    SELECT session_id, 
-                           COUNT(*) as point_count,
-                           MIN(received_at) as start_time,
-                           MAX(received_at) as end_time,
-                           MAX(altitude) as max_altitude
-                    FROM telemetry
-                    WHERE session_id IS NOT NULL
-                    GROUP BY session_id
-                    ORDER BY start_time DESC
-                ''').fetchall()
-                
-                return [
-                    {
-                        'session_id': row['session_id'],
-                        'point_count': row['point_count'],
-                        'start_time': row['start_time'],
-                        'end_time': row['end_time'],
-                        'max_altitude': row['max_altitude'],
-                    }
-                    for row in rows
-                ]
+        with self._reader() as conn:
+            rows = conn.execute('''
+                SELECT session_id, 
+                       COUNT(*) as point_count,
+                       MIN(received_at) as start_time,
+                       MAX(received_at) as end_time,
+                       MAX(altitude) as max_altitude
+                FROM telemetry
+                WHERE session_id IS NOT NULL
+                GROUP BY session_id
+                ORDER BY start_time DESC
+            ''').fetchall()
+        
+        return [
+            {
+                'session_id': row['session_id'],
+                'point_count': row['point_count'],
+                'start_time': row['start_time'],
+                'end_time': row['end_time'],
+                'max_altitude': row['max_altitude'],
+            }
+            for row in rows
+        ]
     
     def get_stats(self) -> Dict:
         """Get database statistics"""
-        with self._lock:
-            with self._get_conn() as conn:
-                count = conn.execute("SELECT COUNT(*) FROM telemetry").fetchone()[0]
-                
-                if count > 0:
-                    first = conn.execute(
-                        "SELECT received_at FROM telemetry ORDER BY received_at ASC LIMIT 1"
-                    ).fetchone()[0]
-                    last = conn.execute(
-                        "SELECT received_at FROM telemetry ORDER BY received_at DESC LIMIT 1"
-                    ).fetchone()[0]
-                    
-                    max_alt = conn.execute(
-                        "SELECT MAX(altitude) FROM telemetry"
-                    ).fetchone()[0]
-                else:
-                    first = last = max_alt = None
-                
-                return {
-                    'total_points': count,
-                    'first_received': first,
-                    'last_received': last,
-                    'max_altitude': max_alt,
-                }
+        now = time.monotonic()
+        cached = self._stats_cache
+        if cached is not None and now - cached[0] < STATS_TTL_SEC:
+            return dict(cached[1])
+        
+        with self._reader() as conn:
+            # One pass; the MIN/MAX columns are NULL on an empty table
+            count, first, last, max_alt = conn.execute(
+                "SELECT COUNT(*), MIN(received_at), MAX(received_at), MAX(altitude) FROM telemetry"
+            ).fetchone()
+        
+        stats = {
+            'total_points': count,
+            'first_received': first,
+            'last_received': last,
+            'max_altitude': max_alt,
+        }
+        self._stats_cache = (now, stats)
+        return dict(stats)
     
     def _row_to_point(self, row: sqlite3.Row) -> TelemetryPoint:
-        """Convert database row to TelemetryPoint"""
-        return TelemetryPoint(
-            received_at=row['received_at'],
-            rssi=row['rssi'],
-            packet_seq=row['packet_seq'],
-            latitude=row['latitude'],
-            longitude=row['longitude'],
-            altitude=row['altitude'],
-            speed=row['speed'],
-            heading=row['heading'],
-            satellites=row['satellites'],
-            fix_type=row['fix_type'],
-            gps_time=row['gps_time'],
-            battery_mv=row['battery_mv'],
-            cpu_temp=row['cpu_temp'],
-            radio_temp=row['radio_temp'],
-            image_id=row['image_id'],
-            image_progress=row['image_progress'],
-            payload_rssi=row['payload_rssi'],
-        )
+        """Convert a row selected as _POINT_COLUMNS to TelemetryPoint"""
+        return TelemetryPoint(*row)
     
     def close(self):
-        """Close database connection"""
+        """Flush queued points and close database connection"""
+        self._closing = True
+        self._flush_event.set()
+        if self._flush_thread.is_alive():
+            self._flush_thread.join(timeout=5.0)
+        self.flush()
+        
         if self._conn:
             self._conn.close()
             self._conn = None
+        
+        with self._readers_lock:
+            for conn in self._readers:
+                conn.close()
+            self._readers.clear()
+            self._idle_readers.clear()
 
 
 class TelemetryProcessor:
@@ -466,13 +798,14 @@ class TelemetryProcessor:
             session_id: Current session identifier
         """
         self.session_id = session_id
-        self.buffer = TelemetryBuffer(buffer_size)
+        self.buffer = (TelemetryArrayBuffer if NUMPY_AVAILABLE else TelemetryBuffer)(buffer_size)
         self.database = TelemetryDatabase(db_path, session_id=session_id)
         self.on_telemetry = on_telemetry
         self.on_alert = on_alert
         
         # Current state
         self._latest: Optional[TelemetryPoint] = None
+        self._latest_dict: Optional[Dict] = None  # _latest.to_dict(), built on first request
         self._lock = Lock()
         
         # Alert thresholds
@@ -519,6 +852,7 @@ class TelemetryProcessor:
         
         with self._lock:
             self._latest = point
+            self._latest_dict = None
             self.stats['packets_received'] += 1
         
         # Store in buffer and database
@@ -581,6 +915,15 @@ class TelemetryProcessor:
         with self._lock:
             return self._latest
     
+    def get_latest_dict(self) -> Optional[Dict]:
+        """get_latest().to_dict(), built once per point however often it is polled"""
+        with self._lock:
+            if self._latest is None:
+                return None
+            if self._latest_dict is None:
+                self._latest_dict = self._latest.to_dict()
+            return self._latest_dict
+    
     def get_current_position(self) -> Optional[Dict]:
         """Get current position for mapping"""
         with self._lock:
@@ -624,35 +967,31 @@ class TelemetryProcessor:
         """Export telemetry to CSV"""
         import csv
         
-        points = self.database.query(start_time=start_time, limit=100000)
+        # CSV header names are the database column names
+        columns = [
+            'received_at', 'gps_time', 'latitude', 'longitude', 'altitude',
+            'speed', 'heading', 'satellites', 'fix_type',
+            'battery_mv', 'cpu_temp', 'radio_temp',
+            'rssi', 'packet_seq', 'image_id', 'image_progress'
+        ]
         
+        count = 0
         with open(filepath, 'w', newline='') as f:
             writer = csv.writer(f)
+            writer.writerow(columns)
             
-            # Header
-            writer.writerow([
-                'received_at', 'gps_time', 'latitude', 'longitude', 'altitude',
-                'speed', 'heading', 'satellites', 'fix_type',
-                'battery_mv', 'cpu_temp', 'radio_temp',
-                'rssi', 'packet_seq', 'image_id', 'image_progress'
-            ])
-            
-            # Data
-            for p in reversed(points):  # Chronological order
-                writer.writerow([
-                    p.received_at, p.gps_time, p.latitude, p.longitude, p.altitude,
-                    p.speed, p.heading, p.satellites, p.fix_type,
-                    p.battery_mv, p.cpu_temp, p.radio_temp,
-                    p.rssi, p.packet_seq, p.image_id, p.image_progress
-                ])
+            # Rows go straight from the cursor to the file, already chronological
+            for row in self.database.iter_rows(columns, start_time=start_time):
+                writer.writerow(row)
+                count += 1
         
-        logger.info(f"Exported {len(points)} telemetry points to {filepath}")
+        logger.info(f"Exported {count} telemetry points to {filepath}")
     
     def export_kml(self, filepath: str, start_time: Optional[float] = None):
         """Export flight track to KML"""
         track = self.database.get_track(start_time=start_time)
         
-        kml_content = '''<?xml version="1.0" encoding="UTF-8"?>
+        header = '''<?xml version="1.0" encoding="UTF-8"?>
 <kml xmlns="http://www.opengis.net/kml/2.2">
 <Document>
     <name>RaptorHab Flight Track</name>
@@ -669,18 +1008,19 @@ class TelemetryProcessor:
             <altitudeMode>absolute</altitudeMode>
             <coordinates>
 '''
-        
-        for point in track:
-            kml_content += f"                {point['lon']},{point['lat']},{point['alt']}\n"
-        
-        kml_content += '''            </coordinates>
+        footer = '''            </coordinates>
         </LineString>
     </Placemark>
 </Document>
 </kml>'''
         
         with open(filepath, 'w') as f:
-            f.write(kml_content)
+            f.write(header)
+            f.writelines(
+                f"                {point['lon']},{point['lat']},{point['alt']}\n"
+                for point in track
+            )
+            f.write(footer)
         
         logger.info(f"Exported KML track to {filepath}")
     
@@ -0,0 +1,114 @@
+"""
+RaptorHab Ground Station - Tile Fetch Helpers
+Shared by the offline map downloaders
+
+Server-independent parts of downloading tiles: host sharding, response
+checks, retry timing and skipping open ocean. Each downloader keeps its
+own servers, HTTP client and rate limits.
+"""
+
+import math
+import random
+from typing import Callable, Dict, Optional, Set, Tuple
+
+from ground.tilemath import lat_lon_to_tile
+
+PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+
+# Open-ocean points (South Pacific, South Atlantic) used to learn the
+# blank ocean tile; a zoom level is only skipped if both agree
+OCEAN_PROBES = [(-45.0, -125.0), (-35.0, -15.0)]
+
+# Longest a worker waits before retrying a tile, however long the server asks for
+MAX_RETRY_DELAY_SEC = 30
+
+
+def server_for_tile(z: int, x: int, y: int, server_count: int) -> int:
+    """
+    Index into a list of server_count tile servers for a tile.
+    
+    A stable hash rather than round-robin, so a given tile always comes
+    from the same host (and its cache) while load spreads across all of them.
+    """
+    return (z * 2654435761 ^ x * 40503 ^ y) % server_count
+
+
+def is_tile_png(data: bytes) -> bool:
+    """
+    Cheap sanity check on a 200 response before it is stored.
+    
+    Rejects HTML/text error pages served with a 200 by checking the PNG
+    signature, and 1x1 placeholder images by the size in the IHDR header.
+    Real tiles - including ~100 byte single-colour ocean tiles - pass.
+    """
+    return (len(data) >= 24 and data[:8] == PNG_SIGNATURE
+            and int.from_bytes(data[16:20], 'big') >= 256
+            and int.from_bytes(data[20:24], 'big') >= 256)
+
+
+def backoff(attempt: int) -> float:
+    """Exponential backoff with jitter, so workers throttled together don't retry in lockstep"""
+    return min(MAX_RETRY_DELAY_SEC, 2 ** attempt) * (0.5 + random.random())
+
+
+def retry_delay(headers, attempt: int) -> float:
+    """
+    Seconds to wait before retrying a throttled/unavailable response.
+    
+    Honours a numeric Retry-After up to MAX_RETRY_DELAY_SEC. Missing,
+    HTTP-date, negative or non-finite values fall back to backoff().
+    """
+    try:
+        delay = float(headers.get('Retry-After', ''))
+    except (TypeError, ValueError):
+        return backoff(attempt)
+    if not math.isfinite(delay) or delay < 0:
+        return backoff(attempt)
+    return min(delay, MAX_RETRY_DELAY_SEC)
+
+
+class OceanTiles:
+    """
+    Fills in open-ocean tiles without an HTTP request.
+    
+    The blank ocean tile for each zoom level is learned by fetching the
+    tiles at OCEAN_PROBES and keeping it only if every probe returned the
+    same bytes. A downloaded tile identical to that blank marks its
+    position as ocean, and its four children at the next zoom level
+    reuse that zoom's blank instead of being downloaded. Tiles are
+    enumerated zoom by zoom, so parents are normally known before their
+    children are reached; unknown parents simply fall back to a download.
+    """
+    
+    def __init__(self, blanks: Dict[int, bytes]):
+        self.blanks = blanks
+        self.skipped = 0
+        self._ocean: Set[Tuple[int, int, int]] = set()
+    
+    @classmethod
+    def learn(cls, min_zoom: int, max_zoom: int,
+              download: Callable[[int, int, int], Optional[bytes]]) -> 'OceanTiles':
+        """Sample the blank ocean tile for each zoom level with download(z, x, y)"""
+        blanks = {}
+        for z in range(min_zoom, max_zoom + 1):
+            probes = {lat_lon_to_tile(lat, lon, z) for lat, lon in OCEAN_PROBES}
+            if len(probes) < len(OCEAN_PROBES):
+                continue  # Probes share a tile at this zoom, nothing to compare
+            samples = [download(z, x, y) for x, y in probes]
+            if samples[0] and all(sample == samples[0] for sample in samples):
+                blanks[z] = samples[0]
+        return cls(blanks)
+    
+    def record(self, z: int, x: int, y: int, data: bytes):
+        """Remember a downloaded tile if it is blank ocean"""
+        if data == self.blanks.get(z):
+            self._ocean.add((z, x, y))
+    
+    def lookup(self, z: int, x: int, y: int) -> Optional[bytes]:
+        """Blank tile data if the parent tile is ocean, else None"""
+        blank = self.blanks.get(z)
+        if blank is None or (z - 1, x >> 1, y >> 1) not in self._ocean:
+            return None
+        self._ocean.add((z, x, y))
+        self.skipped += 1
+        return blank
@@ -0,0 +1,127 @@
+"""
+RaptorHab Ground Station - Slippy Map Tile Math
+Shared by the offline map downloaders
+
+Converts lat/lon bounds into XYZ tile coordinates (Web Mercator, y grows
+southwards) and back to the TMS row numbering MBTiles stores. The array
+functions need NumPy; everything else is plain Python.
+"""
+
+import math
+from typing import Tuple, Generator
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+# Web Mercator stops here; beyond it tile y runs off the map (and tan() blows up at the poles)
+MAX_LATITUDE = 85.0511
+
+
+def lat_lon_to_tile(lat: float, lon: float, zoom: int) -> Tuple[int, int]:
+    """Convert lat/lon to tile coordinates at given zoom level"""
+    lat_rad = math.radians(max(-MAX_LATITUDE, min(MAX_LATITUDE, lat)))
+    n = 2 ** zoom
+    x = int((lon + 180) / 360 * n)
+    y = int((1 - math.log(math.tan(math.pi / 4 + lat_rad / 2)) / math.pi) / 2 * n)
+    return x, y
+
+
+def xyz_to_tms(z: int, y: int) -> int:
+    """Convert XYZ y to TMS y (MBTiles uses TMS); the mapping is its own inverse"""
+    return (1 << z) - 1 - y
+
+
+def count_tiles_for_zoom(zoom: int) -> int:
+    """Count total tiles at a zoom level (worldwide)"""
+    return 4 ** zoom
+
+
+def tile_range(west: float, south: float, east: float, north: float,
+               zoom: int) -> Tuple[int, int, int, int]:
+    """Clamped (x_min, x_max, y_min, y_max) tile range covering bounds at a zoom level"""
+    # Tile y grows southwards, so the north edge gives the smallest y
+    x_min, y_min = lat_lon_to_tile(north, west, zoom)
+    x_max, y_max = lat_lon_to_tile(south, east, zoom)
+    
+    n = 2 ** zoom
+    return max(0, x_min), min(n - 1, x_max), max(0, y_min), min(n - 1, y_max)
+
+
+def count_tiles_in_bounds(west: float, south: float, east: float, north: float,
+                          min_zoom: int, max_zoom: int) -> int:
+    """Count tiles within bounds"""
+    total = 0
+    for z in range(min_zoom, max_zoom + 1):
+        x_min, x_max, y_min, y_max = tile_range(west, south, east, north, z)
+        total += (x_max - x_min + 1) * (y_max - y_min + 1)
+    return total
+
+
+def get_tiles_in_bounds(west: float, south: float, east: float, north: float,
+                        min_zoom: int, max_zoom: int) -> Generator[Tuple[int, int, int], None, None]:
+    """Generate all tile coordinates within bounds for zoom range"""
+    for z in range(min_zoom, max_zoom + 1):
+        x_min, x_max, y_min, y_max = tile_range(west, south, east, north, z)
+        for x in range(x_min, x_max + 1):
+            for y in range(y_min, y_max + 1):
+                yield z, x, y
+
+
+def bounds_around_point(lat: float, lon: float,
+                        radius_km: float) -> Tuple[float, float, float, float]:
+    """(west, south, east, north) of a box reaching radius_km from a point"""
+    lat_delta = radius_km / 111.0
+    lon_delta = radius_km / (111.0 * math.cos(math.radians(lat)))
+    return lon - lon_delta, lat - lat_delta, lon + lon_delta, lat + lat_delta
+
+
+def get_tiles_around_point(lat: float, lon: float, radius_km: float,
+                           min_zoom: int, max_zoom: int) -> Generator[Tuple[int, int, int], None, None]:
+    """Generate tiles within radius of a point"""
+    yield from get_tiles_in_bounds(*bounds_around_point(lat, lon, radius_km), min_zoom, max_zoom)
+
+
+def tiles_array(west: float, south: float, east: float, north: float, zoom: int) -> 'np.ndarray':
+    """Tile coordinates within bounds at one zoom level as an (N, 3) int32 array"""
+    x_min, x_max, y_min, y_max = tile_range(west, south, east, north, zoom)
+    xs = np.arange(x_min, x_max + 1, dtype=np.int32)
+    ys = np.arange(y_min, y_max + 1, dtype=np.int32)
+    X, Y = np.meshgrid(xs, ys, indexing='ij')
+    return np.stack([np.full_like(X, zoom), X, Y], axis=-1).reshape(-1, 3)
+
+
+def get_tiles_array(west: float, south: float, east: float, north: float,
+                    min_zoom: int, max_zoom: int) -> 'np.ndarray':
+    """
+    All tile coordinates within bounds as a single (N, 3) int32 array of (z, x, y).
+    
+    Same order as get_tiles_in_bounds, at 12 bytes per tile instead of a
+    Python tuple each.
+    """
+    return np.concatenate([
+        tiles_array(west, south, east, north, z)
+        for z in range(min_zoom, max_zoom + 1)
+    ])
+
+
+def iter_tiles(tiles) -> Generator[Tuple[int, int, int], None, None]:
+    """Yield (z, x, y) tuples of Python ints from a tile list or array"""
+    if NUMPY_AVAILABLE and isinstance(tiles, np.ndarray):
+        for start in range(0, len(tiles), 4096):
+            yield from map(tuple, tiles[start:start + 4096].tolist())
+    else:
+        yield from tiles
+
+
+def tile_key(z: int, x: int, y: int) -> int:
+    """Pack one (z, x, y) into the same int64 key as tile_keys()"""
+    return (z << 48) | (x << 24) | y
+
+
+def tile_keys(tiles: 'np.ndarray') -> 'np.ndarray':
+    """Pack (z, x, y) rows into one int64 key per tile"""
+    tiles = tiles.astype(np.int64)
+    return (tiles[:, 0] << 48) | (tiles[:, 1] << 24) | tiles[:, 2]
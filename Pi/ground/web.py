@@ -7,27 +7,75 @@ All airborne configuration must be done via config file on the airborne unit.
 """
 
 import logging
-import json
 import time
 import os
-from datetime import datetime
-from typing import Dict, Optional, Any, TYPE_CHECKING
-from threading import Thread
+from collections import deque
+from typing import Dict, Optional, Any, Callable, Tuple, TYPE_CHECKING
+from threading import Thread, Lock
 
 from flask import Flask, render_template, jsonify, request, send_file, Response
 from flask_socketio import SocketIO, emit
 
+try:
+    import orjson
+    from flask.json.provider import DefaultJSONProvider
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# eventlet only works once the process has been monkey patched (main.py does
+# this at startup); otherwise stay on plain threads
+try:
+    from eventlet import patcher as eventlet_patcher
+    EVENTLET_AVAILABLE = eventlet_patcher.is_monkey_patched('socket')
+except ImportError:
+    EVENTLET_AVAILABLE = False
+
 if TYPE_CHECKING:
     from ground.receiver import PacketReceiver
     from ground.telemetry import TelemetryProcessor
     from ground.decoder import FountainDecoder
-    from ground.storage import ImageStorage
+    from ground.storage import ImageStorage, StoredImage
     from ground.config import GroundConfig
 
-from ground.offline_maps import OfflineMapManager, get_content_type
+from ground.offline_maps import OfflineMapManager
 
 logger = logging.getLogger(__name__)
 
+# How long (seconds) polled read endpoints reuse their last result, so
+# several browsers polling at once share one computation
+STATUS_CACHE_TTL = 0.25
+MAPS_STATUS_CACHE_TTL = 2.0
+SESSIONS_CACHE_TTL = 2.0
+# Image lists and tracks, keyed by path and query string
+READ_CACHE_TTL = 2.0
+# Expired entries are swept once the cache holds more keys than this
+RESPONSE_CACHE_MAX_KEYS = 128
+# Browsers reuse images this long before revalidating; short because the
+# airborne unit can reuse image IDs
+IMAGE_MAX_AGE_SEC = 60
+# Socket.IO pushes are coalesced and sent at most this often (seconds)
+EMIT_INTERVAL_SEC = 0.05
+# Points held for the next telemetry_batch; oldest are dropped beyond this
+EMIT_BUFFER_MAX = 256
+# How often connected clients get a status_patch (seconds)
+STATUS_PUSH_INTERVAL_SEC = 2.0
+
+
+if ORJSON_AVAILABLE:
+    class OrjsonProvider(DefaultJSONProvider):
+        """Flask JSON provider encoding with orjson instead of the stdlib json module"""
+        
+        def dumps(self, obj: Any, **kwargs) -> str:
+            option = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+            if self.sort_keys:
+                option |= orjson.OPT_SORT_KEYS
+            # Types orjson doesn't know go through Flask's default hook
+            return orjson.dumps(obj, default=self.default, option=option).decode()
+        
+        def loads(self, s, **kwargs) -> Any:
+            return orjson.loads(s)
+
 
 def create_app(
     config: 'GroundConfig',
@@ -61,6 +109,8 @@ def create_app(
         static_folder=static_dir
     )
     app.config['SECRET_KEY'] = 'raptorhab-ground-station'
+    if ORJSON_AVAILABLE:
+        app.json = OrjsonProvider(app)
     
     # Add CORS headers to all responses
     @app.after_request
@@ -71,7 +121,9 @@ def create_app(
         return response
     
     # Create SocketIO
-    socketio = SocketIO(app, cors_allowed_origins="*", async_mode='threading')
+    async_mode = 'eventlet' if EVENTLET_AVAILABLE else 'threading'
+    socketio = SocketIO(app, cors_allowed_origins="*", async_mode=async_mode)
+    logger.info(f"SocketIO async mode: {async_mode}")
     
     # Store references
     app.config['receiver'] = receiver
@@ -82,33 +134,94 @@ def create_app(
     app.config['ground_station'] = ground_station
     
     # Initialize offline maps manager
-    offline_maps = OfflineMapManager(config.map_offline_path)
+    offline_maps = OfflineMapManager(
+        config.map_offline_path, config.map_tile_cache_size, config.map_offline_immutable
+    )
     if config.map_offline_file:
         offline_maps.set_default(config.map_offline_file)
     app.config['offline_maps'] = offline_maps
     
+    # The routes read these closure variables directly; app.config keeps
+    # copies for anything outside create_app. api_maps_config rebinds
+    # ground_config (GroundConfig is frozen).
+    ground_config = config
+    tile_headers = {
+        'Cache-Control': 'public, max-age=86400',
+        'X-Tile-Source': 'offline'
+    }
+    
+    # key -> (expiry on time.monotonic, value) for cached(); each key gets
+    # its own lock so concurrent misses build the value once
+    response_cache: Dict[str, Tuple[float, Any]] = {}
+    cache_locks: Dict[str, Lock] = {}
+    
+    def cached(key: str, ttl: float, build: Callable[[], Any]) -> Any:
+        """Return build()'s value, reusing it for ttl seconds"""
+        hit = response_cache.get(key)
+        if hit and time.monotonic() < hit[0]:
+            return hit[1]
+        with cache_locks.setdefault(key, Lock()):
+            hit = response_cache.get(key)
+            now = time.monotonic()
+            if hit and now < hit[0]:
+                return hit[1]
+            value = build()
+            response_cache[key] = (now + ttl, value)
+        
+        if len(response_cache) > RESPONSE_CACHE_MAX_KEYS:
+            for stale in [k for k, (expiry, _) in list(response_cache.items()) if expiry <= now]:
+                response_cache.pop(stale, None)
+                cache_locks.pop(stale, None)
+        return value
+    
+    def cached_request(build: Callable[[], Any]) -> Any:
+        """cached() keyed on this request's path and query string"""
+        key = f"{request.path}?{request.query_string.decode()}"
+        return cached(key, READ_CACHE_TTL, build)
+    
+    def invalidate(*prefixes: str):
+        """Drop cached values whose key starts with any of prefixes"""
+        for key in [k for k in list(response_cache) if k.startswith(prefixes)]:
+            response_cache.pop(key, None)
+    
+    # For WebServer, which learns about new images outside any request
+    app.config['invalidate_cache'] = invalidate
+    
+    # Pages depend on their own path and on the config; of the config only
+    # the two map flags change at runtime (api_maps_config), so each page
+    # is rendered once per combination of them and served as bytes after.
+    # (WebServer may write the templates after create_app returns.)
+    rendered_pages: Dict[Tuple[str, bool, bool], bytes] = {}
+    
+    def render_page(template: str) -> Response:
+        """Serve a page template, rendering it once per map setting"""
+        key = (template, ground_config.map_offline_enabled, ground_config.map_prefer_offline)
+        html = rendered_pages.get(key)
+        if html is None:
+            html = rendered_pages[key] = render_template(template, config=ground_config).encode()
+        return Response(html, mimetype='text/html')
+    
     # === Routes ===
     
     @app.route('/')
     def index():
         """Main dashboard"""
-        return render_template('index.html', config=config)
+        return render_page('index.html')
     
     @app.route('/map')
     def map_view():
         """Map view"""
-        return render_template('map.html', config=config)
+        return render_page('map.html')
     
     @app.route('/images')
     def images_view():
         """Image gallery"""
-        return render_template('images.html', config=config)
+        return render_page('images.html')
     
     # === API Endpoints ===
     
-    @app.route('/api/status')
-    def api_status():
-        """Get system status"""
+    def build_status() -> Dict:
+        """Assemble the /api/status payload"""
         status = {
             'time': time.time(),
             'receiver': receiver.get_stats() if receiver else {},
@@ -123,7 +236,68 @@ def create_app(
             if tracking:
                 status['tracking'] = tracking
         
-        return jsonify(status)
+        return status
+    
+    def current_status() -> Dict:
+        """The /api/status payload, shared for STATUS_CACHE_TTL"""
+        return cached('status', STATUS_CACHE_TTL, build_status)
+    
+    # (version, status) last pushed over Socket.IO. Each status_patch names
+    # the version it applies to, so clients that missed one can resync.
+    pushed_status: Tuple[int, Dict[str, Any]] = (0, {})
+    status_lock = Lock()
+    connected_clients = 0
+    
+    def status_patch(status: Dict) -> Optional[Dict]:
+        """
+        Diff status against the last push (two levels deep) and make it the new base
+        
+        Returns {'base', 'version', 'changed', 'removed'}, where removed
+        lists key paths ([key] or [key, subkey]), or None if nothing changed.
+        """
+        nonlocal pushed_status
+        with status_lock:
+            version, old_status = pushed_status
+            changed = {}
+            removed = []
+            for key, value in status.items():
+                if key not in old_status:
+                    changed[key] = value
+                    continue
+                old = old_status[key]
+                if value == old:
+                    continue
+                if isinstance(value, dict) and isinstance(old, dict):
+                    changed[key] = {k: v for k, v in value.items() if k not in old or old[k] != v}
+                    removed.extend([key, k] for k in old.keys() - value.keys())
+                else:
+                    changed[key] = value
+            removed.extend([key] for key in old_status.keys() - status.keys())
+            
+            if not changed and not removed:
+                return None
+            pushed_status = (version + 1, status)
+            return {'base': version, 'version': version + 1, 'changed': changed, 'removed': removed}
+    
+    def send_status():
+        """Send the requesting client the last pushed status and its version"""
+        with status_lock:
+            never_pushed = pushed_status[0] == 0
+        if never_pushed:
+            # Establish a base; other clients' patches resync from it
+            status_patch(current_status())
+        version, status = pushed_status
+        emit('status', status, version)
+    
+    # For WebServer's push loop
+    app.config['current_status'] = current_status
+    app.config['status_patch'] = status_patch
+    app.config['has_clients'] = lambda: connected_clients > 0
+    
+    @app.route('/api/status')
+    def api_status():
+        """Get system status"""
+        return jsonify(current_status())
     
     @app.route('/api/tracking')
     def api_tracking():
@@ -160,10 +334,7 @@ def create_app(
         if not telemetry:
             return jsonify({'error': 'Telemetry not available'}), 503
         
-        point = telemetry.get_latest()
-        if point:
-            return jsonify(point.to_dict())
-        return jsonify({})
+        return jsonify(telemetry.get_latest_dict() or {})
     
     @app.route('/api/telemetry/recent')
     def api_telemetry_recent():
@@ -172,8 +343,7 @@ def create_app(
             return jsonify({'error': 'Telemetry not available'}), 503
         
         count = request.args.get('count', 100, type=int)
-        points = telemetry.buffer.get_latest(count)
-        return jsonify([p.to_dict() for p in points])
+        return jsonify(telemetry.buffer.get_latest_dicts(count))
     
     @app.route('/api/telemetry/track')
     def api_telemetry_track():
@@ -185,9 +355,21 @@ def create_app(
         end = request.args.get('end', type=float)
         interval = request.args.get('interval', 1.0, type=float)
         session = request.args.get('session', 'current')  # 'current', 'all', or specific session_id
+        max_points = request.args.get('max_points', type=int)
+        
+        with_tracking = ground_station and request.args.get('tracking', 0, type=int)
+        
+        def build_track():
+            track = telemetry.database.get_track(
+                start, end, interval, session_id=session, max_points=max_points
+            )
+            
+            # Optionally include distance/bearing from the ground station per point
+            if with_tracking:
+                ground_station.add_tracking_to_track(track)
+            return track
         
-        track = telemetry.database.get_track(start, end, interval, session_id=session)
-        return jsonify(track)
+        return jsonify(cached_request(build_track))
     
     @app.route('/api/telemetry/track/clear', methods=['POST'])
     def api_telemetry_track_clear():
@@ -199,6 +381,7 @@ def create_app(
         session_id = data.get('session_id')  # None = current session
         
         count = telemetry.database.clear_track(session_id)
+        invalidate('telemetry_sessions', '/api/telemetry/track')
         return jsonify({'status': 'ok', 'points_deleted': count})
     
     @app.route('/api/telemetry/sessions')
@@ -207,7 +390,7 @@ def create_app(
         if not telemetry:
             return jsonify({'error': 'Telemetry not available'}), 503
         
-        sessions = telemetry.database.get_sessions()
+        sessions = cached('telemetry_sessions', SESSIONS_CACHE_TTL, telemetry.database.get_sessions)
         return jsonify(sessions)
     
     @app.route('/api/images')
@@ -217,8 +400,7 @@ def create_app(
             return jsonify({'error': 'Storage not available'}), 503
         
         count = request.args.get('count', 20, type=int)
-        images = storage.get_recent_images(count)
-        return jsonify([
+        return jsonify(cached_request(lambda: [
             {
                 'image_id': img.image_id,
                 'session_id': img.session_id,
@@ -229,8 +411,39 @@ def create_app(
                 'capture_time': img.capture_time,
                 'received_time': img.received_time,
             }
-            for img in images
-        ])
+            for img in storage.get_recent_images(count)
+        ]))
+    
+    def serve_image(info: Optional['StoredImage'], thumbnail: bool = False):
+        """Serve an image (or its thumbnail), answering revalidations with 304"""
+        if info is None:
+            return jsonify({'error': 'Image not found'}), 404
+        
+        # Fall back to the full image when there is no thumbnail
+        path, etag = info.filepath, info.checksum
+        if thumbnail and info.thumbnail_path and os.path.exists(info.thumbnail_path):
+            path, etag = info.thumbnail_path, f"{info.checksum}-thumb"
+        
+        # The checksum is an MD5 of the image, so a match needs no file access
+        if etag and request.if_none_match.contains(etag):
+            response = Response(status=304, headers={
+                'Cache-Control': f'public, max-age={IMAGE_MAX_AGE_SEC}'
+            })
+            response.set_etag(etag)
+            return response
+        
+        # Stream from disk (wsgi.file_wrapper where the server has one)
+        # rather than reading the whole image into memory
+        try:
+            return send_file(
+                path,
+                mimetype='image/webp',
+                etag=etag or False,
+                max_age=IMAGE_MAX_AGE_SEC,
+                conditional=True
+            )
+        except OSError:
+            return jsonify({'error': 'Image not found'}), 404
     
     @app.route('/api/images/<int:image_id>')
     def api_image(image_id: int):
@@ -238,10 +451,7 @@ def create_app(
         if not storage:
             return jsonify({'error': 'Storage not available'}), 503
         
-        data = storage.get_image_data(image_id)
-        if data:
-            return Response(data, mimetype='image/webp')
-        return jsonify({'error': 'Image not found'}), 404
+        return serve_image(storage.get_image(image_id))
     
     @app.route('/api/images/<int:image_id>/thumbnail')
     def api_image_thumbnail(image_id: int):
@@ -249,16 +459,7 @@ def create_app(
         if not storage:
             return jsonify({'error': 'Storage not available'}), 503
         
-        data = storage.get_thumbnail_data(image_id)
-        if data:
-            return Response(data, mimetype='image/webp')
-        
-        # Fall back to full image
-        data = storage.get_image_data(image_id)
-        if data:
-            return Response(data, mimetype='image/webp')
-        
-        return jsonify({'error': 'Image not found'}), 404
+        return serve_image(storage.get_image(image_id), thumbnail=True)
     
     @app.route('/api/images/pending')
     def api_images_pending():
@@ -290,23 +491,25 @@ def create_app(
     
     def serve_tile(z: int, x: int, y: int, ext: str, map_name: str = None):
         """Internal function to serve tiles"""
-        offline_maps = app.config.get('offline_maps')
-        ground_config = app.config.get('ground_config')
-        
         # Try offline first if enabled and preferred
         if ground_config.map_offline_enabled and ground_config.map_prefer_offline:
-            if offline_maps and offline_maps.has_offline_maps:
+            if offline_maps.has_offline_maps:
+                # Tiles are MBTiles blobs, not files, so there is nothing for
+                # send_file to stream; instead answer revalidations from the
+                # ETag alone, before the tile is read
+                etag = offline_maps.tile_etag(z, x, y, map_name)
+                if etag and request.if_none_match.contains(etag):
+                    response = Response(status=304, headers=tile_headers)
+                    response.set_etag(etag)
+                    return response
+                
                 result = offline_maps.get_tile(z, x, y, map_name)
                 if result:
-                    data, fmt = result
-                    return Response(
-                        data, 
-                        mimetype=get_content_type(fmt),
-                        headers={
-                            'Cache-Control': 'public, max-age=86400',
-                            'X-Tile-Source': 'offline'
-                        }
-                    )
+                    data, content_type = result
+                    response = Response(data, mimetype=content_type, headers=tile_headers)
+                    if etag:
+                        response.set_etag(etag)
+                    return response
         
         # Return 204 No Content to signal client should use online fallback
         return Response(
@@ -314,12 +517,8 @@ def create_app(
             headers={'X-Tile-Source': 'none'}
         )
     
-    @app.route('/api/maps/status')
-    def api_maps_status():
-        """Get offline maps status"""
-        offline_maps = app.config.get('offline_maps')
-        ground_config = app.config.get('ground_config')
-        
+    def build_maps_status() -> Dict:
+        """Assemble the /api/maps/status payload"""
         status = {
             'offline_enabled': ground_config.map_offline_enabled,
             'prefer_offline': ground_config.map_prefer_offline,
@@ -327,25 +526,35 @@ def create_app(
             'maps': {}
         }
         
-        if offline_maps:
-            map_status = offline_maps.get_status()
-            status['offline_available'] = map_status.get('available', False)
-            status['maps'] = map_status.get('maps', {})
-            status['maps_directory'] = map_status.get('maps_directory', '')
+        map_status = offline_maps.get_status()
+        status['offline_available'] = map_status.get('available', False)
+        status['maps'] = map_status.get('maps', {})
+        status['maps_directory'] = map_status.get('maps_directory', '')
         
-        return jsonify(status)
+        return status
+    
+    @app.route('/api/maps/status')
+    def api_maps_status():
+        """Get offline maps status"""
+        return jsonify(cached('maps_status', MAPS_STATUS_CACHE_TTL, build_maps_status))
     
     @app.route('/api/maps/config', methods=['POST'])
     def api_maps_config():
         """Update map configuration"""
-        ground_config = app.config.get('ground_config')
+        nonlocal ground_config
         data = request.get_json() or {}
+        overrides = {}
         
         if 'prefer_offline' in data:
-            ground_config.map_prefer_offline = bool(data['prefer_offline'])
+            overrides['map_prefer_offline'] = bool(data['prefer_offline'])
         
         if 'offline_enabled' in data:
-            ground_config.map_offline_enabled = bool(data['offline_enabled'])
+            overrides['map_offline_enabled'] = bool(data['offline_enabled'])
+        
+        # GroundConfig is frozen; swap in an updated copy
+        ground_config = ground_config.with_overrides(**overrides)
+        app.config['ground_config'] = ground_config
+        invalidate('maps_status')
         
         return jsonify({'status': 'ok'})
     
@@ -357,8 +566,7 @@ def create_app(
         if not storage:
             return jsonify({'error': 'Storage not available'}), 503
         
-        sessions = storage.get_sessions()
-        return jsonify([
+        return jsonify(cached_request(lambda: [
             {
                 'session_id': s.session_id,
                 'name': s.name,
@@ -369,8 +577,8 @@ def create_app(
                 'total_size_bytes': s.total_size_bytes,
                 'is_current': s.session_id == storage.session_id,
             }
-            for s in sessions
-        ])
+            for s in storage.get_sessions()
+        ]))
     
     @app.route('/api/sessions/<session_id>')
     def api_session(session_id: str):
@@ -400,8 +608,7 @@ def create_app(
             return jsonify({'error': 'Storage not available'}), 503
         
         count = request.args.get('count', 100, type=int)
-        images = storage.get_session_images(session_id, count)
-        return jsonify([
+        return jsonify(cached_request(lambda: [
             {
                 'image_id': img.image_id,
                 'session_id': img.session_id,
@@ -412,8 +619,8 @@ def create_app(
                 'capture_time': img.capture_time,
                 'received_time': img.received_time,
             }
-            for img in images
-        ])
+            for img in storage.get_session_images(session_id, count)
+        ]))
     
     @app.route('/api/sessions/<session_id>/images/<int:image_id>')
     def api_session_image(session_id: str, image_id: int):
@@ -421,10 +628,7 @@ def create_app(
         if not storage:
             return jsonify({'error': 'Storage not available'}), 503
         
-        data = storage.get_image_data_by_session(session_id, image_id)
-        if data:
-            return Response(data, mimetype='image/webp')
-        return jsonify({'error': 'Image not found'}), 404
+        return serve_image(storage.get_image_by_session(session_id, image_id))
     
     @app.route('/api/sessions/<session_id>/images/<int:image_id>/thumbnail')
     def api_session_image_thumbnail(session_id: str, image_id: int):
@@ -432,10 +636,7 @@ def create_app(
         if not storage:
             return jsonify({'error': 'Storage not available'}), 503
         
-        data = storage.get_thumbnail_data_by_session(session_id, image_id)
-        if data:
-            return Response(data, mimetype='image/webp')
-        return jsonify({'error': 'Image not found'}), 404
+        return serve_image(storage.get_image_by_session(session_id, image_id), thumbnail=True)
     
     @app.route('/api/sessions/<session_id>/rename', methods=['POST'])
     def api_session_rename(session_id: str):
@@ -448,6 +649,7 @@ def create_app(
             return jsonify({'error': 'Name required'}), 400
         
         storage.rename_session(session_id, data['name'])
+        invalidate('/api/sessions', '/api/images')
         return jsonify({'status': 'ok', 'session_id': session_id, 'name': data['name']})
     
     @app.route('/api/sessions/<session_id>/delete', methods=['POST'])
@@ -461,6 +663,7 @@ def create_app(
             return jsonify({'error': 'Cannot delete current active session'}), 400
         
         if storage.delete_session(session_id):
+            invalidate('/api/sessions', '/api/images')
             return jsonify({'status': 'ok', 'session_id': session_id})
         return jsonify({'error': 'Failed to delete session'}), 500
     
@@ -470,24 +673,20 @@ def create_app(
         if not storage:
             return jsonify({'error': 'Storage not available'}), 503
         
-        import tempfile
-        
-        # Create zip in temp directory
-        temp_dir = tempfile.mkdtemp()
-        zip_path = storage.export_session_zip(session_id, temp_dir)
+        # Stream the archive as it is built; nothing is written to disk
+        chunks = storage.iter_session_zip(session_id)
         
-        if not zip_path:
-            return jsonify({'error': 'Failed to create ZIP or session empty'}), 404
+        if chunks is None:
+            return jsonify({'error': 'Session empty or not found'}), 404
         
         # Get session info for filename
         session = storage.get_session(session_id)
         filename = f"{session.display_name.replace(' ', '_').replace(':', '-')}.zip" if session else f"{session_id}.zip"
         
-        return send_file(
-            zip_path,
+        return Response(
+            chunks,
             mimetype='application/zip',
-            as_attachment=True,
-            download_name=filename
+            headers={'Content-Disposition': f'attachment; filename="{filename}"'}
         )
     
     @app.route('/api/sessions/<session_id>/images/delete', methods=['POST'])
@@ -505,6 +704,7 @@ def create_app(
             return jsonify({'error': 'image_ids must be a list'}), 400
         
         deleted = storage.delete_images(session_id, image_ids)
+        invalidate('/api/sessions', '/api/images')
         return jsonify({
             'status': 'ok',
             'deleted': deleted,
@@ -518,6 +718,7 @@ def create_app(
             return jsonify({'error': 'Storage not available'}), 503
         
         if storage.delete_image(session_id, image_id):
+            invalidate('/api/sessions', '/api/images')
             return jsonify({'status': 'ok', 'image_id': image_id})
         return jsonify({'error': 'Image not found or delete failed'}), 404
     
@@ -525,17 +726,21 @@ def create_app(
     
     @socketio.on('connect')
     def handle_connect():
+        nonlocal connected_clients
+        connected_clients += 1
         logger.debug("Client connected")
-        # Send initial status
-        emit('status', {
-            'time': time.time(),
-            'receiver': receiver.get_stats() if receiver else {},
-            'telemetry': telemetry.get_flight_stats() if telemetry else {},
-            'decoder': decoder.get_status() if decoder else {},
-        })
+        # Send initial status; later status_patch events apply on top of it
+        send_status()
+    
+    @socketio.on('status_sync')
+    def handle_status_sync():
+        """Client missed a status_patch; resend the current base"""
+        send_status()
     
     @socketio.on('disconnect')
     def handle_disconnect():
+        nonlocal connected_clients
+        connected_clients = max(0, connected_clients - 1)
         logger.debug("Client disconnected")
     
     return app, socketio
@@ -559,8 +764,13 @@ class WebServer:
             config, receiver, telemetry, decoder, storage, ground_station
         )
         self._thread: Optional[Thread] = None
+        self._emit_thread: Optional[Thread] = None
         self._running = False
         
+        # Outgoing pushes, drained by the emit thread
+        self._tx_buf: deque = deque(maxlen=EMIT_BUFFER_MAX)
+        self._tx_status: Optional[dict] = None
+        
         # Ensure templates exist
         template_dir = os.path.join(os.path.dirname(__file__), 'templates')
         if not os.path.exists(template_dir):
@@ -578,6 +788,12 @@ class WebServer:
             daemon=True
         )
         self._thread.start()
+        self._emit_thread = Thread(
+            target=self._emit_loop,
+            name="WebEmit",
+            daemon=True
+        )
+        self._emit_thread.start()
         logger.info(f"Web server starting on port {self.config.web_port}")
     
     def stop(self):
@@ -599,13 +815,43 @@ class WebServer:
         except Exception as e:
             logger.error(f"Web server error: {e}")
     
+    def _emit_loop(self):
+        """Send buffered pushes every EMIT_INTERVAL_SEC, status every STATUS_PUSH_INTERVAL_SEC"""
+        config = self._app.config
+        next_status = time.monotonic()
+        while self._running:
+            time.sleep(EMIT_INTERVAL_SEC)
+            try:
+                if time.monotonic() >= next_status:
+                    next_status = time.monotonic() + STATUS_PUSH_INTERVAL_SEC
+                    if config['has_clients']():
+                        self.emit_status(config['current_status']())
+                self._flush_emits()
+            except Exception as e:
+                logger.error(f"Emit error: {e}")
+    
+    def _flush_emits(self):
+        """Emit buffered telemetry as one batch and the newest status"""
+        # popleft is atomic, so this races safely with emit_telemetry appending
+        batch = []
+        while self._tx_buf:
+            batch.append(self._tx_buf.popleft())
+        if batch:
+            self._socketio.emit('telemetry_batch', batch)
+        
+        status, self._tx_status = self._tx_status, None
+        if status is not None:
+            patch = self._app.config['status_patch'](status)
+            if patch:
+                self._socketio.emit('status_patch', patch)
+    
     def emit_telemetry(self, data: dict):
-        """Emit telemetry update to all clients"""
-        self._socketio.emit('telemetry', data)
+        """Queue telemetry update for the next batch to all clients"""
+        self._tx_buf.append(data)
     
     def emit_status(self, data: dict):
-        """Emit status update to all clients"""
-        self._socketio.emit('status', data)
+        """Queue status update to all clients; only the newest is sent, as a diff"""
+        self._tx_status = data
     
     def emit_alert(self, alert_type: str, message: str, data: Any = None):
         """Emit alert to all clients"""
@@ -618,6 +864,8 @@ class WebServer:
     
     def emit_image_complete(self, image_id: int, metadata: dict):
         """Emit image complete notification"""
+        # Clients refetch the image lists on this event; don't serve them a cached one
+        self._app.config['invalidate_cache']('/api/sessions', '/api/images')
         self._socketio.emit('image_complete', {
             'image_id': image_id,
             **metadata
@@ -910,7 +1158,7 @@ def create_default_templates(template_dir: str):
         }
     }
     
-    socket.on('telemetry', function(data) {
+    function onTelemetry(data) {
         if (data.latitude && data.longitude) {
             const pos = [data.latitude, data.longitude];
             
@@ -926,6 +1174,12 @@ def create_default_templates(template_dir: str):
             trackPoints.push(pos);
             track.setLatLngs(trackPoints);
         }
+    }
+    
+    socket.on('telemetry', onTelemetry);
+    // The server batches points; replay them in order
+    socket.on('telemetry_batch', function(batch) {
+        batch.forEach(onTelemetry);
     });
     
     // Load existing track
@@ -0,0 +1,54 @@
+"""
+TelemetryDatabase flush tests
+"""
+
+import sqlite3
+import sys
+import threading
+
+from ground.telemetry import POINT_FIELDS, TelemetryDatabase, TelemetryPoint
+
+
+POINT_COUNT = 5000
+
+
+def make_point(seq: int) -> TelemetryPoint:
+    """A point whose fields are all seq, received_at included"""
+    return TelemetryPoint(*([seq] * len(POINT_FIELDS)))
+
+
+def test_concurrent_flush_keeps_every_point(tmp_path):
+    db_path = str(tmp_path / "telemetry.db")
+    db = TelemetryDatabase(db_path, session_id="test")
+    errors = []
+    inserting = threading.Event()
+    inserting.set()
+    # Switch threads often so the flushers really interleave
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+
+    def flusher():
+        try:
+            while inserting.is_set():
+                db.flush()
+        except Exception as e:
+            errors.append(e)
+
+    flushers = [threading.Thread(target=flusher) for _ in range(2)]
+    for t in flushers:
+        t.start()
+    for seq in range(POINT_COUNT):
+        db.insert(make_point(seq))
+    inserting.clear()
+    for t in flushers:
+        t.join()
+    sys.setswitchinterval(interval)
+    db.close()
+
+    assert errors == []
+    conn = sqlite3.connect(db_path)
+    try:
+        stored = conn.execute("SELECT COUNT(*), COUNT(DISTINCT packet_seq) FROM telemetry").fetchone()
+    finally:
+        conn.close()
+    assert stored == (POINT_COUNT, POINT_COUNT)